@@ -5,88 +5,109 @@ Run this before using the video_text_extractor to check your environment.
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from util import get_cached_tesseract_version
 
-def check_dependencies():
-    """Check if all required dependencies are installed."""
-    print("Checking dependencies...\n")
-    
-    missing_deps = []
-    installed_deps = []
-    
-    # Check Python version
-    print(f"Python version: {sys.version.split()[0]}", end=" ")
+
+def probe_python():
+    """Check the Python interpreter version."""
+    version = sys.version.split()[0]
     if sys.version_info >= (3, 7):
-        print("✓")
-    else:
-        print("✗ (Python 3.7+ required)")
-        missing_deps.append("Python 3.7+")
-    
-    # Check OpenCV
+        return [f"Python version: {version} ✓"], None, None
+    return [f"Python version: {version} ✗ (Python 3.7+ required)"], None, "Python 3.7+"
+
+
+def probe_opencv():
+    """Check OpenCV."""
     try:
         import cv2
-        print(f"opencv-python: {cv2.__version__} ✓")
-        installed_deps.append("opencv-python")
+        return [f"opencv-python: {cv2.__version__} ✓"], "opencv-python", None
     except ImportError:
-        print("opencv-python: Not installed ✗")
-        missing_deps.append("opencv-python")
-    
-    # Check NumPy
+        return ["opencv-python: Not installed ✗"], None, "opencv-python"
+
+
+def probe_numpy():
+    """Check NumPy."""
     try:
         import numpy as np
-        print(f"numpy: {np.__version__} ✓")
-        installed_deps.append("numpy")
+        return [f"numpy: {np.__version__} ✓"], "numpy", None
     except ImportError:
-        print("numpy: Not installed ✗")
-        missing_deps.append("numpy")
-    
-    # Check Pillow
+        return ["numpy: Not installed ✗"], None, "numpy"
+
+
+def probe_pillow():
+    """Check Pillow."""
     try:
         from PIL import Image
         import PIL
-        print(f"Pillow: {PIL.__version__} ✓")
-        installed_deps.append("Pillow")
+        return [f"Pillow: {PIL.__version__} ✓"], "Pillow", None
     except ImportError:
-        print("Pillow: Not installed ✗")
-        missing_deps.append("Pillow")
-    
-    # Check pytesseract
+        return ["Pillow: Not installed ✗"], None, "Pillow"
+
+
+def probe_pytesseract():
+    """Check pytesseract and the Tesseract binary it drives."""
     try:
         import pytesseract
-        print(f"pytesseract: Installed ✓")
-        installed_deps.append("pytesseract")
-        
-        # Check if Tesseract binary is available
-        try:
-            version = pytesseract.get_tesseract_version()
-            print(f"  Tesseract OCR: {version} ✓")
-        except pytesseract.TesseractNotFoundError:
-            print("  Tesseract OCR: Not found ✗")
-            print("  Please install Tesseract:")
-            print("    Linux:   sudo apt-get install tesseract-ocr")
-            print("    macOS:   brew install tesseract")
-            print("    Windows: https://github.com/UB-Mannheim/tesseract/wiki")
-            missing_deps.append("tesseract-ocr (system package)")
     except ImportError:
-        print("pytesseract: Not installed ✗")
-        missing_deps.append("pytesseract")
+        return ["pytesseract: Not installed ✗"], None, "pytesseract"
     
-    # Check imagehash
-    try:
-        import imagehash
-        print(f"imagehash: Installed ✓")
-        installed_deps.append("imagehash")
-    except ImportError:
-        print("imagehash: Not installed ✗")
-        missing_deps.append("imagehash")
+    lines = ["pytesseract: Installed ✓"]
     
-    # Check tqdm
+    # Check if Tesseract binary is available
+    try:
+        version = get_cached_tesseract_version()
+        lines.append(f"  Tesseract OCR: {version} ✓")
+        return lines, "pytesseract", None
+    except pytesseract.TesseractNotFoundError:
+        lines.extend([
+            "  Tesseract OCR: Not found ✗",
+            "  Please install Tesseract:",
+            "    Linux:   sudo apt-get install tesseract-ocr",
+            "    macOS:   brew install tesseract",
+            "    Windows: https://github.com/UB-Mannheim/tesseract/wiki",
+        ])
+        return lines, "pytesseract", "tesseract-ocr (system package)"
+
+
+def probe_tqdm():
+    """Check tqdm."""
     try:
         import tqdm
-        print(f"tqdm: {tqdm.__version__} ✓")
-        installed_deps.append("tqdm")
+        return [f"tqdm: {tqdm.__version__} ✓"], "tqdm", None
     except ImportError:
-        print("tqdm: Not installed ✗")
-        missing_deps.append("tqdm")
+        return ["tqdm: Not installed ✗"], None, "tqdm"
+
+
+PROBES = [
+    probe_python,
+    probe_opencv,
+    probe_numpy,
+    probe_pillow,
+    probe_pytesseract,
+    probe_tqdm,
+]
+
+
+def check_dependencies():
+    """Check if all required dependencies are installed."""
+    print("Checking dependencies...\n")
+    
+    missing_deps = []
+    installed_deps = []
+    
+    # Probes are independent, so run them concurrently; results are
+    # collected in a fixed order to keep the output deterministic
+    with ThreadPoolExecutor(max_workers=len(PROBES)) as executor:
+        results = list(executor.map(lambda probe: probe(), PROBES))
+    
+    for lines, installed, missing in results:
+        for line in lines:
+            print(line)
+        if installed:
+            installed_deps.append(installed)
+        if missing:
+            missing_deps.append(missing)
     
     # Summary
     print("\n" + "=" * 50)
@@ -97,7 +118,7 @@ def check_dependencies():
         print("\nTo install Python packages, run:")
         print("  pip install -r requirements.txt")
         print("\nOr install individually:")
-        print("  pip install opencv-python pytesseract Pillow imagehash tqdm numpy")
+        print("  pip install opencv-python pytesseract Pillow tqdm numpy")
         return False
     else:
         print(f"✓ All dependencies installed! ({len(installed_deps)} packages)")
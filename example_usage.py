@@ -6,25 +6,24 @@ This script demonstrates how to import and use the video_text_extractor
 functions in your own Python code instead of using the command-line interface.
 """
 
+import os
 import json
 import sys
+import argparse
+import multiprocessing
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
-# Import functions from the main script
-# Note: Ensure video_text_extractor.py is in the same directory or in PYTHONPATH
-try:
-    from video_text_extractor import (
-        extract_frames,
-        extract_text_from_image,
-        calculate_blur_score,
-        are_images_similar
-    )
-    import cv2
-    from PIL import Image
-    import imagehash
-except ImportError as e:
-    print(f"Error importing dependencies: {e}")
-    print("Make sure video_text_extractor.py is in the same directory")
+# Heavy dependencies (OpenCV and the library itself) are imported
+# inside each example, so importing this module or running one example doesn't pay
+# for all of them.
+# Note: Ensure video_text_lib.py is in the same directory or in PYTHONPATH
+
+
+def _missing_dependency(error):
+    """Report a missing dependency and exit."""
+    print(f"Error importing dependencies: {error}")
+    print("Make sure video_text_lib.py is in the same directory")
     print("and all dependencies are installed (run: pip install -r requirements.txt)")
     sys.exit(1)
 
@@ -34,6 +33,11 @@ def example_basic_usage():
     print("Example 1: Basic Usage")
     print("-" * 50)
     
+    try:
+        from video_text_lib import extract_frames, extract_text_from_image
+    except ImportError as e:
+        _missing_dependency(e)
+    
     video_path = "sample_video.mp4"
     
     # Extract frames
@@ -63,6 +67,12 @@ def example_custom_processing():
     print("\n\nExample 2: Custom Processing")
     print("-" * 50)
     
+    try:
+        import cv2
+        from video_text_lib import calculate_blur_score
+    except ImportError as e:
+        _missing_dependency(e)
+    
     video_path = "sample_video.mp4"
     
     # Open video manually for custom processing
@@ -96,20 +106,28 @@ def example_image_comparison():
     print("\n\nExample 3: Image Similarity Comparison")
     print("-" * 50)
     
+    try:
+        import cv2
+        from video_text_lib import are_images_similar, compute_frame_hash, hash_distance
+    except ImportError as e:
+        _missing_dependency(e)
+    
     # This example requires two image files
     image1_path = "output_images/0000000.png"
     image2_path = "output_images/0000500.png"
     
     try:
         # Load images and calculate hashes
-        img1 = Image.open(image1_path)
-        img2 = Image.open(image2_path)
+        img1 = cv2.imread(image1_path)
+        img2 = cv2.imread(image2_path)
+        if img1 is None or img2 is None:
+            raise FileNotFoundError(image1_path if img1 is None else image2_path)
         
-        hash1 = imagehash.phash(img1)
-        hash2 = imagehash.phash(img2)
+        hash1 = compute_frame_hash(img1, hash_size=8)
+        hash2 = compute_frame_hash(img2, hash_size=8)
         
         # Calculate difference
-        difference = abs(hash1 - hash2)
+        difference = hash_distance(hash1, hash2)
         
         print(f"Image 1: {image1_path}")
         print(f"Image 2: {image2_path}")
@@ -125,8 +143,60 @@ def example_image_comparison():
         print("Run example_basic_usage() first to generate images")
 
 
-def example_batch_processing():
-    """Example 4: Process multiple videos in batch"""
+def _limit_worker_threads():
+    """Pool initializer: keep each worker single-threaded to avoid oversubscription."""
+    import cv2
+    
+    # Tesseract (spawned by pytesseract) inherits this from the worker's environment
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    cv2.setNumThreads(1)
+
+
+def _process_one_video(video_path):
+    """Extract frames and text from a single video (runs in a worker process)."""
+    try:
+        from video_text_lib import extract_frames, extract_text_from_image
+        
+        # Extract frames
+        frames, stats, _ = extract_frames(
+            video_path=video_path,
+            interval_ms=1000,
+            deduplicate=True,
+            filter_blurry=True,
+            blur_threshold=100.0,
+            images_dir=f"output_{Path(video_path).stem}"
+        )
+        
+        # Extract text from all frames
+        video_results = []
+        for frame_path, timestamp in frames:
+            text_blocks = extract_text_from_image(frame_path, join_char='space')
+            video_results.append({
+                'file': frame_path,
+                'timestamp_ms': timestamp,
+                'text': text_blocks
+            })
+        
+        return {
+            'video': video_path,
+            'frames_extracted': len(frames),
+            'stats': stats,
+            'data': video_results
+        }
+    except Exception as e:
+        return {'video': video_path, 'error': str(e)}
+
+
+def _ocr_one(frame):
+    """OCR a single (frame_path, timestamp) pair (runs in a worker process)."""
+    from video_text_lib import extract_text_from_image
+    
+    frame_path, timestamp = frame
+    return frame_path, timestamp, extract_text_from_image(frame_path, join_char='space')
+
+
+def example_batch_processing(jobs=None):
+    """Example 4: Process multiple videos in batch (one worker process per video)"""
     print("\n\nExample 4: Batch Processing")
     print("-" * 50)
     
@@ -136,43 +206,18 @@ def example_batch_processing():
         "video3.mp4"
     ]
     
-    results = []
+    # Videos are independent and OCR is CPU-bound, so use processes rather than threads
+    max_workers = jobs or min(len(videos), os.cpu_count() or 1)
     
-    for video_path in videos:
-        print(f"\nProcessing: {video_path}")
-        
-        try:
-            # Extract frames
-            frames, stats, _ = extract_frames(
-                video_path=video_path,
-                interval_ms=1000,
-                deduplicate=True,
-                filter_blurry=True,
-                blur_threshold=100.0,
-                images_dir=f"output_{Path(video_path).stem}"
-            )
-            
-            # Extract text from all frames
-            video_results = []
-            for frame_path, timestamp in frames:
-                text_blocks = extract_text_from_image(frame_path, join_char='space')
-                video_results.append({
-                    'file': frame_path,
-                    'timestamp_ms': timestamp,
-                    'text': text_blocks
-                })
-            
-            results.append({
-                'video': video_path,
-                'frames_extracted': len(frames),
-                'stats': stats,
-                'data': video_results
-            })
-            
-            print(f"  ✓ Extracted {len(frames)} frames")
-            
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_limit_worker_threads) as executor:
+        for result in executor.map(_process_one_video, videos):
+            print(f"\nProcessed: {result['video']}")
+            if 'error' in result:
+                print(f"  ✗ Error: {result['error']}")
+                continue
+            results.append(result)
+            print(f"  ✓ Extracted {result['frames_extracted']} frames")
     
     # Save combined results
     output_file = "batch_results.json"
@@ -187,11 +232,16 @@ def example_filtered_text_extraction():
     print("\n\nExample 5: High-Confidence Text Only")
     print("-" * 50)
     
+    try:
+        from video_text_lib import iter_frames
+    except ImportError as e:
+        _missing_dependency(e)
+    
     video_path = "sample_video.mp4"
     min_confidence = 80.0  # Only accept text with 80%+ confidence
     
-    # Extract frames
-    frames, stats, _ = extract_frames(
+    # Extract frames lazily: each frame is yielded as soon as it's saved
+    frames = iter_frames(
         video_path=video_path,
         interval_ms=500,
         deduplicate=True,
@@ -202,9 +252,17 @@ def example_filtered_text_extraction():
     
     high_confidence_text = []
     
-    for frame_path, timestamp in frames:
-        text_blocks = extract_text_from_image(frame_path, join_char='space')
-        
+    # OCR is CPU-bound and independent per frame, so spread it across processes.
+    # Frames are submitted while the video is still being decoded, so OCR of the
+    # first frames overlaps extraction of the next ones instead of waiting for it.
+    # Workers are spawned rather than forked: iter_frames() runs decoding and hashing
+    # threads meanwhile, and forking while they hold OpenCV/FFmpeg locks can deadlock.
+    spawn_context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(initializer=_limit_worker_threads, mp_context=spawn_context) as executor:
+        futures = [executor.submit(_ocr_one, frame) for frame in frames]
+        ocr_results = [future.result() for future in futures]
+    
+    for frame_path, timestamp, text_blocks in ocr_results:
         # Filter by confidence
         for block in text_blocks:
             if block['confidence'] >= min_confidence:
@@ -224,6 +282,12 @@ def example_filtered_text_extraction():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Programmatic usage examples of video_text_lib')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Number of worker processes for the batch processing example '
+                             '(default: one per video, up to the number of CPUs)')
+    args = parser.parse_args()
+    
     print("Video Text Extractor - Programmatic Usage Examples")
     print("=" * 50)
     print()
@@ -236,7 +300,7 @@ if __name__ == "__main__":
     # example_basic_usage()
     # example_custom_processing()
     # example_image_comparison()
-    # example_batch_processing()
+    # example_batch_processing(jobs=args.jobs)
     # example_filtered_text_extraction()
     
     print("\nTo run examples, uncomment the function calls at the end of this script.")
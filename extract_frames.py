@@ -8,55 +8,72 @@ deduplication, blur filtering, and stability checking.
 
 import os
 import sys
-import json
 import time
 import shutil
 import argparse
-import pytesseract
-from video_text_lib import extract_frames
+from util import atomic_write, json_dumps_bytes, require_tesseract, write_json_items
 
 
-def create_debug_graph(debug_info, output_file='debug_graph.png', settings=None):
+# Debug graph limits: beyond these point counts, downsample / drop markers
+MAX_GRAPH_POINTS = 2000
+MAX_GRAPH_MARKERS = 500
+
+
+def create_debug_graph(debug_arrays, output_file='debug_graph.png', settings=None):
     """
     Create a graph showing stability and duplicate scores over time.
     
     Args:
-        debug_info: List of frame debug information dictionaries
+        debug_arrays: Dict of per-frame 'timestamp_ms', 'stability_score' and
+            'duplicate_score' arrays, as filled by video_text_lib.iter_frames
         output_file: Path to save the graph image
         settings: Optional dict with settings including thresholds
     """
+    # Nothing to plot, don't pay for importing matplotlib and allocating a figure
+    if not debug_arrays or not len(debug_arrays['timestamp_ms']):
+        return
+    
     try:
+        import matplotlib
+        matplotlib.use('Agg')  # Non-interactive backend, we only render to file
         import matplotlib.pyplot as plt
+        import numpy as np
     except ImportError:
         print("Warning: matplotlib not installed. Skipping graph generation.", file=sys.stderr)
         print("Install with: pip install matplotlib", file=sys.stderr)
         return
     
-    # Extract data from debug_info
-    timestamps = []
-    stability_scores = []
-    duplicate_scores = []
+    # Wrap the column buffers without copying (missing scores are NaN, so they are not plotted)
+    timestamps = np.frombuffer(debug_arrays['timestamp_ms'], dtype=np.int64)
+    stability_scores = np.frombuffer(debug_arrays['stability_score'], dtype=np.float32)
+    duplicate_scores = np.frombuffer(debug_arrays['duplicate_score'], dtype=np.float32)
+    
+    # Downsample long recordings, the graph can't show more points than this anyway
+    if len(timestamps) > MAX_GRAPH_POINTS:
+        step = len(timestamps) // MAX_GRAPH_POINTS
+        timestamps = timestamps[::step]
+        stability_scores = stability_scores[::step]
+        duplicate_scores = duplicate_scores[::step]
     
-    for frame in debug_info:
-        timestamps.append(frame['timestamp_ms'])
-        # Use None for missing values to avoid plotting them
-        stability_scores.append(frame.get('stability_score', None))
-        duplicate_scores.append(frame.get('duplicate_score', None))
+    # Markers only help readability when there are few points
+    show_markers = len(timestamps) <= MAX_GRAPH_MARKERS
     
     # Create the plot
     fig, ax = plt.subplots(figsize=(12, 6))
     
     # Plot stability scores
     ax.plot(timestamps, stability_scores, label='Stability Score', 
-            marker='o', linestyle='-', linewidth=2, markersize=4, color='#1f77b4')
+            marker='o' if show_markers else None, linestyle='-', linewidth=2, markersize=4,
+            color='#1f77b4', rasterized=True)
     
     # Plot duplicate scores
     ax.plot(timestamps, duplicate_scores, label='Duplicate Score',
-            marker='s', linestyle='-', linewidth=2, markersize=4, color='#ff7f0e')
+            marker='s' if show_markers else None, linestyle='-', linewidth=2, markersize=4,
+            color='#ff7f0e', rasterized=True)
     
     # Add threshold lines if settings are provided
     if settings:
-        if timestamps:  # Only draw if we have data
+        if len(timestamps):  # Only draw if we have data
             time_min, time_max = min(timestamps), max(timestamps)
             
             # Stability threshold
@@ -91,7 +108,7 @@ def create_debug_graph(debug_info, output_file='debug_graph.png', settings=None)
     plt.tight_layout()
     
     # Save the plot
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    plt.savefig(output_file, dpi=100, bbox_inches='tight')
     plt.close()
     
     print(f"Debug graph saved to: {output_file}")
@@ -110,6 +127,7 @@ Examples:
   python extract_frames.py video.mp4 --no-deduplicate --no-filter-blurry
   python extract_frames.py video.mp4 --output-dir my_output
   python extract_frames.py video.mp4 --start-time 5000 --stop-time 15000
+  python extract_frames.py video.mp4 --yes
         """
     )
     
@@ -126,8 +144,14 @@ Examples:
                         help='Disable blurry frame filtering (default)')
     parser.add_argument('--blur-threshold', type=float, default=100.0,
                         help='Laplacian variance threshold for blur detection (default: 100.0)')
+    parser.add_argument('--blur-downscale', type=int, default=1,
+                        help='Shrink frames by this factor before blur detection: much faster, but scores '
+                             'change so --blur-threshold must be tuned again (default: 1, full resolution)')
     parser.add_argument('--threshold', type=int, default=20,
                         help='Hash difference threshold for both deduplication and stability checks (default: 20)')
+    parser.add_argument('--coarse-dedupe', action='store_true', default=False,
+                        help='Skip frames whose 8x8 average hash matches the last saved frame without computing '
+                             'their full hash: faster on static slides, but may miss small changes')
     parser.add_argument('--check-stability', action='store_true', dest='check_stability', default=True,
                         help='Enable stability check to skip frames during transitions/animations (default)')
     parser.add_argument('--no-check-stability', action='store_false', dest='check_stability',
@@ -138,10 +162,19 @@ Examples:
                         help='Start time in milliseconds (default: 0)')
     parser.add_argument('--stop-time', type=int, default=None,
                         help='Stop time in milliseconds (default: None, process until end of video)')
+    parser.add_argument('--hash-workers', type=int, default=max(1, min(4, (os.cpu_count() or 1) // 2)),
+                        help='Number of threads hashing upcoming frames and writing saved ones in the background; '
+                             'above 1, frames are also decoded in a separate thread and up to ~28 full frames '
+                             'are buffered (~170 MB at 1080p, ~700 MB at 4K) (default: half the CPUs, at most 4)')
+    parser.add_argument('--image-format', choices=['png', 'jpg'], default='png',
+                        help='Format of the saved frames: png (lossless) or jpg (faster to write, smaller, '
+                             'but with compression artifacts) (default: png)')
     parser.add_argument('--debug', action='store_true', dest='debug', default=False,
                         help='Enable debug mode to save detailed frame information to debug.json')
     parser.add_argument('--output-dir', default=None,
                         help='Output directory for all extracted data (default: video name without extension)')
+    parser.add_argument('--yes', '-y', '--force', action='store_true', dest='yes', default=False,
+                        help='Overwrite an existing output directory without asking')
     
     args = parser.parse_args()
     
@@ -155,77 +188,118 @@ Examples:
         video_basename = os.path.splitext(os.path.basename(args.video_file))[0]
         args.output_dir = video_basename
     
-    # Check if output directory exists and prompt user
+    # Check if output directory exists and prompt user (unless --yes was given)
     if os.path.exists(args.output_dir):
         print(f"Warning: Output directory '{args.output_dir}' already exists.")
         print(f"Its contents will be removed to avoid conflicts.")
-        response = input("Do you want to continue? (y/N): ").strip().lower()
-        if response != 'y':
-            print("Operation cancelled.")
-            sys.exit(0)
+        if not args.yes:
+            # Never block waiting for input when not attached to a terminal
+            if not sys.stdin.isatty():
+                print("Error: Output directory exists. Use --yes to overwrite it.", file=sys.stderr)
+                sys.exit(1)
+            response = input("Do you want to continue? (y/N): ").strip().lower()
+            if response != 'y':
+                print("Operation cancelled.")
+                sys.exit(0)
         # Remove the existing directory
-        import shutil
         shutil.rmtree(args.output_dir)
         print(f"Removed existing directory: {args.output_dir}")
     
+    # Import heavy dependencies only once arguments are validated, so that
+    # --help and argument errors don't pay for loading OpenCV and friends
+    from video_text_lib import iter_frames
+    
     # Set up paths within the output directory
     args.images_dir = os.path.join(args.output_dir, 'frames')
     args.output = os.path.join(args.output_dir, 'frames.json')
     
-    # Check if Tesseract is installed (required by video_text_lib for image hashing operations)
-    try:
-        pytesseract.get_tesseract_version()
-    except pytesseract.TesseractNotFoundError:
-        print("Error: Tesseract is not installed. Please install it first.", file=sys.stderr)
-        print("  Linux:   sudo apt-get install tesseract-ocr", file=sys.stderr)
-        print("  macOS:   brew install tesseract", file=sys.stderr)
-        print("  Windows: Download from https://github.com/UB-Mannheim/tesseract/wiki", file=sys.stderr)
-        sys.exit(1)
+    # Check if Tesseract is installed: frames are extracted for OCR, so report a missing
+    # Tesseract now rather than after a long extraction (hashing itself only uses OpenCV)
+    require_tesseract()
     
-    # Start timing
-    start_time = time.time()
-    
-    print(f"Frame Extractor")
-    print(f"{'=' * 50}")
-    print(f"Input video: {args.video_file}")
-    print(f"Output directory: {args.output_dir}")
-    print(f"Interval: {args.interval}ms")
-    print(f"Threshold: {args.threshold}")
-    print(f"Deduplication: {'enabled' if args.deduplicate else 'disabled'}")
-    print(f"Blur filtering: {'enabled' if args.filter_blurry else 'disabled'}")
+    # Build the settings banner and print it in a single write
+    lines = [
+        "Frame Extractor",
+        '=' * 50,
+        f"Input video: {args.video_file}",
+        f"Output directory: {args.output_dir}",
+        f"Interval: {args.interval}ms",
+        f"Threshold: {args.threshold}",
+        f"Deduplication: {'enabled' if args.deduplicate else 'disabled'}",
+        f"Blur filtering: {'enabled' if args.filter_blurry else 'disabled'}",
+    ]
+    if args.deduplicate and args.coarse_dedupe:
+        lines.insert(-1, "Coarse deduplication: enabled")
     if args.filter_blurry:
-        print(f"Blur threshold: {args.blur_threshold}")
-    print(f"Stability check: {'enabled' if args.check_stability else 'disabled'}")
+        lines.append(f"Blur threshold: {args.blur_threshold}")
+        if args.blur_downscale > 1:
+            lines.append(f"Blur downscale: {args.blur_downscale}x")
+    lines.append(f"Stability check: {'enabled' if args.check_stability else 'disabled'}")
     if args.check_stability:
-        print(f"Stability lookahead: {args.stability_lookahead}ms")
+        lines.append(f"Stability lookahead: {args.stability_lookahead}ms")
     if args.start_time > 0 or args.stop_time is not None:
         if args.stop_time is not None:
             duration = args.stop_time - args.start_time
-            print(f"Time range: {args.start_time}ms - {args.stop_time}ms (duration: {duration}ms, {duration/1000:.1f}s)")
+            lines.append(f"Time range: {args.start_time}ms - {args.stop_time}ms (duration: {duration}ms, {duration/1000:.1f}s)")
         else:
-            print(f"Start time: {args.start_time}ms ({args.start_time/1000:.1f}s)")
-    print(f"Debug mode: {'enabled' if args.debug else 'disabled'}")
-    print(f"Output files: frames.json, frames/")
-    print()
+            lines.append(f"Start time: {args.start_time}ms ({args.start_time/1000:.1f}s)")
+    lines.append(f"Image format: {args.image_format}")
+    lines.append(f"Hash workers: {args.hash_workers}")
+    lines.append(f"Debug mode: {'enabled' if args.debug else 'disabled'}")
+    lines.append("Output files: frames.json, frames/")
+    sys.stdout.write('\n'.join(lines) + '\n\n')
     
-    # Extract frames
+    # Extract frames (monotonic clock, immune to wall-clock adjustments)
     print("Extracting frames from video...")
+    start_time = time.perf_counter()
+    frame_stats = {}
+    debug_info = []
+    debug_arrays = {}
+    saved_count = 0
+    
+    # The metadata file is opened before iter_frames() creates the frames directory,
+    # so create it (and the output directory) first
+    os.makedirs(args.images_dir, exist_ok=True)
+    
+    # Save frame metadata JSON while frames are being extracted, one frame per line.
+    # Only the path needs escaping, so records are formatted directly instead of
+    # building and serializing a dict per frame.
     try:
-        saved_frames, frame_stats, debug_info = extract_frames(
-            args.video_file,
-            args.interval,
-            args.deduplicate,
-            args.filter_blurry,
-            args.blur_threshold,
-            args.images_dir,
-            args.check_stability,
-            args.stability_threshold,
-            args.stability_lookahead,
-            args.start_time,
-            args.stop_time,
-            args.dedupe_threshold,
-            args.debug
-        )
+        with atomic_write(args.output) as f:
+            f.write(b'[\n')
+            separator = b''
+            for image_path, timestamp_ms in iter_frames(
+                args.video_file,
+                args.interval,
+                args.deduplicate,
+                args.filter_blurry,
+                args.blur_threshold,
+                args.images_dir,
+                args.check_stability,
+                args.stability_threshold,
+                args.stability_lookahead,
+                args.start_time,
+                args.stop_time,
+                args.dedupe_threshold,
+                args.debug,
+                stats=frame_stats,
+                debug_info=debug_info,
+                debug_arrays=debug_arrays,
+                hash_workers=args.hash_workers,
+                blur_downscale=args.blur_downscale,
+                image_format=args.image_format,
+                coarse_dedupe=args.coarse_dedupe
+            ):
+                f.write(b'%s  {"file":%s,"timestamp_ms":%d}' % (separator, json_dumps_bytes(image_path), timestamp_ms))
+                separator = b',\n'
+                saved_count += 1
+            
+            # Exiting here discards the partially written file
+            if not saved_count:
+                print("Error: No frames were extracted from the video.", file=sys.stderr)
+                sys.exit(1)
+            
+            f.write(b'\n]\n')
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -233,23 +307,8 @@ Examples:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
     
-    if not saved_frames:
-        print("Error: No frames were extracted from the video.", file=sys.stderr)
-        sys.exit(1)
-    
     print()
     
-    # Save frame metadata JSON
-    frame_metadata = []
-    for image_path, timestamp_ms in saved_frames:
-        frame_metadata.append({
-            'file': image_path,
-            'timestamp_ms': timestamp_ms
-        })
-    
-    with open(args.output, 'w', encoding='utf-8') as f:
-        json.dump(frame_metadata, f, indent=2, ensure_ascii=False)
-    
     # Save debug JSON if debug mode is enabled
     if args.debug and debug_info:
         debug_file = os.path.join(args.output_dir, 'debug.json')
@@ -264,6 +323,7 @@ Examples:
                 'dedupe_threshold': args.dedupe_threshold,
                 'filter_blurry': args.filter_blurry,
                 'blur_threshold': args.blur_threshold,
+                'blur_downscale': args.blur_downscale,
                 'check_stability': args.check_stability,
                 'stability_threshold': args.stability_threshold,
                 'stability_lookahead_ms': args.stability_lookahead,
@@ -280,34 +340,29 @@ Examples:
             'frames': debug_info
         }
         
-        with open(debug_file, 'w', encoding='utf-8') as f:
-            # Write opening brace and metadata
-            f.write('{\n')
-            f.write('  "video_file": ' + json.dumps(debug_data['video_file']) + ',\n')
-            f.write('  "settings": ' + json.dumps(debug_data['settings'], indent=4).replace('\n', '\n  ') + ',\n')
-            f.write('  "stats": ' + json.dumps(debug_data['stats'], indent=4).replace('\n', '\n  ') + ',\n')
-            f.write('  "frames": [\n')
+        with atomic_write(debug_file) as f:
+            # Write metadata in a single formatting pass, leaving the object open
+            header = {key: debug_data[key] for key in ('video_file', 'settings', 'stats')}
+            f.write(json_dumps_bytes(header, indent=True)[:-2])
+            f.write(b',\n  "frames": [\n')
             
             # Write each frame's debug info on a single line
-            for i, frame_debug in enumerate(debug_info):
-                line = '    ' + json.dumps(frame_debug, ensure_ascii=False, separators=(',', ': '))
-                if i < len(debug_info) - 1:
-                    line += ','
-                f.write(line + '\n')
+            write_json_items(f, debug_info, b'    ')
             
             # Write closing
-            f.write('  ]\n')
-            f.write('}\n')
+            f.write(b'  ]\n')
+            f.write(b'}\n')
         
         print(f"Debug info saved to: {debug_file}")
         
         # Create debug graph with settings
         debug_graph_path = os.path.join(args.output_dir, 'debug_graph.png')
-        create_debug_graph(debug_info, debug_graph_path, debug_data['settings'])
+        create_debug_graph(debug_arrays, debug_graph_path, debug_data['settings'])
+    elif args.debug:
+        print("No debug info to write.")
     
     # Calculate execution time
-    end_time = time.time()
-    execution_time = end_time - start_time
+    execution_time = time.perf_counter() - start_time
     
     # Display final statistics
     print()
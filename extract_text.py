@@ -6,14 +6,19 @@ Command-line interface for extracting text from image frames using Tesseract OCR
 """
 
 import sys
-import json
 import time
 import os
-import glob
 import argparse
-import pytesseract
-from video_text_lib import extract_text_from_image
-from tqdm import tqdm
+import importlib.util
+from util import atomic_write, load_json, require_tesseract, write_json_items
+
+
+# Frame images extract_frames.py can write
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# Images per worker task (each task reuses one Tesseract instance for its batch),
+# or per EasyOCR model call
+OCR_BATCH_SIZE = 16
 
 
 def main():
@@ -28,28 +33,46 @@ Examples:
   python extract_text.py frames/ --output text_results.json
   python extract_text.py frames/ --join-char newline
   python extract_text.py frames/ --frames-metadata frames.json
+  python extract_text.py frames/ --jobs 2
+  python extract_text.py frames/ --backend easyocr
+  python extract_text.py frames/ --preprocess
+  python extract_text.py frames/ --psm 6
         """
     )
     
-    parser.add_argument('images_dir', help='Directory containing image frames (PNG files)')
+    parser.add_argument('images_dir', help='Directory containing image frames (PNG or JPEG files)')
     parser.add_argument('--join-char', choices=['space', 'newline'], default='space',
                         help='Character to join multi-line text (default: space)')
     parser.add_argument('--output', default='output.json',
                         help='Path for output JSON file (default: output.json)')
     parser.add_argument('--frames-metadata', default=None,
                         help='Optional JSON file with frame metadata (from extract_frames.py) to include timestamps')
+    parser.add_argument('--jobs', type=int, default=max(1, (os.cpu_count() or 1) // 2),
+                        help='Number of images to OCR in parallel (default: half the CPUs, tesseract backend only)')
+    parser.add_argument('--backend', choices=['tesseract', 'easyocr'], default='tesseract',
+                        help='OCR engine: tesseract (CPU, default) or easyocr (batched, uses the GPU when available)')
+    parser.add_argument('--preprocess', action='store_true',
+                        help='Upscale 2x and binarize images before OCR, helps with small or low-contrast text '
+                             '(slower, tesseract backend only)')
+    parser.add_argument('--psm', type=int, choices=range(1, 14), default=3, metavar='{1..13}',
+                        help='Tesseract page segmentation mode, e.g. 6 to read each image as a single block of text, '
+                             'faster but merges separate text areas (default: 3, automatic)')
     
     args = parser.parse_args()
     
-    # Check if Tesseract is installed
-    try:
-        pytesseract.get_tesseract_version()
-    except pytesseract.TesseractNotFoundError:
-        print("Error: Tesseract is not installed. Please install it first.", file=sys.stderr)
-        print("  Linux:   sudo apt-get install tesseract-ocr", file=sys.stderr)
-        print("  macOS:   brew install tesseract", file=sys.stderr)
-        print("  Windows: Download from https://github.com/UB-Mannheim/tesseract/wiki", file=sys.stderr)
-        sys.exit(1)
+    # Import heavy dependencies only once arguments are validated, so that
+    # --help and argument errors don't pay for loading OpenCV and friends
+    from video_text_lib import extract_text_from_images, extract_text_from_images_easyocr
+    from tqdm import tqdm
+    
+    if args.backend == 'easyocr':
+        # Check if EasyOCR is installed (without importing it yet, that is slow)
+        if importlib.util.find_spec('easyocr') is None:
+            print("Error: EasyOCR is not installed. Install it with: pip install easyocr", file=sys.stderr)
+            sys.exit(1)
+    else:
+        # Check if Tesseract is installed
+        require_tesseract()
     
     # Check if images directory exists
     if not os.path.exists(args.images_dir):
@@ -60,74 +83,106 @@ Examples:
         print(f"Error: Not a directory: {args.images_dir}", file=sys.stderr)
         sys.exit(1)
     
-    # Load frame metadata if provided
-    frame_metadata_map = {}
+    # Load frame metadata if provided, keeping only the timestamps keyed by filename
+    timestamps_by_name = {}
     if args.frames_metadata:
         if not os.path.exists(args.frames_metadata):
             print(f"Warning: Frame metadata file not found: {args.frames_metadata}", file=sys.stderr)
         else:
             try:
-                with open(args.frames_metadata, 'r', encoding='utf-8') as f:
-                    frames_data = json.load(f)
-                    # Build a map from filename to metadata
-                    for frame in frames_data:
-                        filename = os.path.basename(frame['file'])
-                        frame_metadata_map[filename] = frame
+                frames_data = load_json(args.frames_metadata)
+                # Build a map from filename to timestamp
+                timestamps_by_name = {
+                    os.path.basename(frame['file']): frame['timestamp_ms']
+                    for frame in frames_data
+                    if 'timestamp_ms' in frame
+                }
             except Exception as e:
                 print(f"Warning: Could not load frame metadata: {e}", file=sys.stderr)
     
-    # Find all PNG files in the directory
-    image_pattern = os.path.join(args.images_dir, "*.png")
-    image_files = sorted(glob.glob(image_pattern))
+    # Find all image files in the directory (scandir reuses the directory entry
+    # type info, so no extra stat() or pattern matching per file)
+    with os.scandir(args.images_dir) as entries:
+        image_files = sorted(
+            entry.path for entry in entries
+            if entry.name.endswith(IMAGE_EXTENSIONS) and not entry.name.startswith('.') and entry.is_file()
+        )
     
     if not image_files:
-        print(f"Error: No PNG files found in directory: {args.images_dir}", file=sys.stderr)
+        print(f"Error: No PNG or JPEG files found in directory: {args.images_dir}", file=sys.stderr)
         sys.exit(1)
     
     # Start timing
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     print(f"Text Extractor")
     print(f"{'=' * 50}")
     print(f"Images directory: {args.images_dir}")
     print(f"Images found: {len(image_files)}")
     print(f"Join character: {args.join_char}")
+    print(f"OCR backend: {args.backend}")
+    if args.backend == 'tesseract':
+        print(f"Parallel jobs: {args.jobs}")
+        print(f"Preprocessing: {'enabled' if args.preprocess else 'disabled'}")
+        print(f"Page segmentation mode: {args.psm}")
     print(f"Output: {args.output}")
     if args.frames_metadata:
-        print(f"Frame metadata: {args.frames_metadata} ({len(frame_metadata_map)} entries loaded)")
+        print(f"Frame metadata: {args.frames_metadata} ({len(timestamps_by_name)} entries loaded)")
     print()
     
     # Extract text from images
     print("Extracting text from images...")
-    results = []
     total_text_blocks = 0
     
-    for image_path in tqdm(image_files, desc="Extracting text", unit="image"):
-        text_blocks = extract_text_from_image(image_path, args.join_char)
-        total_text_blocks += len(text_blocks)
-        
-        # Get metadata for this frame if available
-        filename = os.path.basename(image_path)
-        frame_metadata = frame_metadata_map.get(filename, {})
-        
-        result = {
-            'file': image_path,
-            'text': text_blocks
-        }
-        
-        # Add timestamp if available from metadata
-        if 'timestamp_ms' in frame_metadata:
-            result['timestamp_ms'] = frame_metadata['timestamp_ms']
-        
-        results.append(result)
-    
-    # Save output JSON
-    with open(args.output, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    if args.backend == 'easyocr':
+        # The model batches images itself (on GPU), a single process drives it
+        all_text_blocks = extract_text_from_images_easyocr(image_files, args.join_char, batch_size=OCR_BATCH_SIZE)
+    else:
+        # OCR is CPU-bound and independent per image, so batches are spread across processes
+        all_text_blocks = extract_text_from_images(image_files, args.join_char, jobs=args.jobs,
+                                                   batch_size=OCR_BATCH_SIZE, preprocess=args.preprocess,
+                                                   psm=args.psm)
+    
+    # All image paths are "<images_dir>/<filename>", so the filename is a plain slice
+    prefix_len = len(os.path.join(args.images_dir, ''))
+    
+    # Results are yielded in submission order, so they line up with image_files
+    # Repaint the progress bar at most twice a second / every 0.5% of images
+    progress = tqdm(zip(image_files, all_text_blocks), total=len(image_files), desc="Extracting text",
+                    unit="image", mininterval=0.5, miniters=max(1, len(image_files) // 200), smoothing=0)
+    
+    def results():
+        """Build each image's result as its text blocks come in."""
+        nonlocal total_text_blocks
+        for image_path, text_blocks in progress:
+            total_text_blocks += len(text_blocks)
+            
+            result = {
+                'file': image_path,
+                'text': text_blocks
+            }
+            
+            # Add timestamp if available from metadata
+            timestamp_ms = timestamps_by_name.get(image_path[prefix_len:])
+            if timestamp_ms is not None:
+                result['timestamp_ms'] = timestamp_ms
+            
+            yield result
+    
+    # Stream results to the output JSON as they come instead of keeping them all in memory,
+    # one image per line
+    try:
+        with atomic_write(args.output) as f:
+            f.write(b'[\n')
+            write_json_items(f, results(), b'  ')
+            f.write(b']\n')
+    finally:
+        # Shut the OCR workers down now (even on errors or Ctrl+C) rather than
+        # whenever the generator gets collected
+        all_text_blocks.close()
     
     # Calculate execution time
-    end_time = time.time()
-    execution_time = end_time - start_time
+    execution_time = time.perf_counter() - start_time
     
     # Display final statistics
     print()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the extract_frames.py command-line script.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+import unittest
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_test_video(path, fps=10, seconds=3, size=(320, 240)):
+    """Write a short video of white slides with a changing black label."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, size)
+    for i in range(fps * seconds):
+        frame = np.full((size[1], size[0], 3), 255, dtype=np.uint8)
+        cv2.putText(frame, f"Slide {i // fps}", (20, size[1] // 2), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 0), 3)
+        writer.write(frame)
+    writer.release()
+
+
+@unittest.skipIf(cv2 is None, "OpenCV and NumPy are required")
+@unittest.skipIf(shutil.which('tesseract') is None, "extract_frames.py requires Tesseract")
+class ExtractFramesCliTest(unittest.TestCase):
+
+    def test_output_directory_is_created(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            video_path = os.path.join(tmp_dir, 'video.avi')
+            write_test_video(video_path)
+            output_dir = os.path.join(tmp_dir, 'does', 'not', 'exist')
+            
+            result = subprocess.run(
+                [sys.executable, os.path.join(REPO_DIR, 'extract_frames.py'), video_path,
+                 '--output-dir', output_dir, '--interval', '500', '--yes'],
+                capture_output=True, text=True, cwd=tmp_dir
+            )
+            
+            self.assertEqual(result.returncode, 0, result.stderr)
+            with open(os.path.join(output_dir, 'frames.json'), encoding='utf-8') as f:
+                frames = json.load(f)
+            self.assertTrue(frames)
+            for frame in frames:
+                self.assertTrue(os.path.isfile(frame['file']))
+
+
+if __name__ == '__main__':
+    unittest.main()
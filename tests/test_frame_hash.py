@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the perceptual frame hash.
+
+compute_frame_hash() reimplements imagehash.phash(hash_size=32) with OpenCV.
+Resizing and DCT differ slightly, so distances are close to imagehash's but
+not bit-identical; these tests check they stay close and that frames clearly
+on either side of the default threshold are still classified the same way.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import cv2
+    import numpy as np
+    from video_text_lib import compute_frame_hash, hash_distance
+except ImportError:
+    cv2 = None
+
+try:
+    import imagehash
+    from PIL import Image
+except ImportError:
+    imagehash = None
+
+# Default --threshold of extract_frames.py
+DEFAULT_THRESHOLD = 20
+
+# Max difference allowed between the OpenCV and imagehash distances of a pair
+MAX_DISTANCE_DRIFT = 16
+
+
+def make_slide(title, title_y=200):
+    """Draw a white slide with a title and a second line of text."""
+    slide = np.full((480, 640, 3), 250, dtype=np.uint8)
+    cv2.putText(slide, title, (30, title_y), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (20, 20, 20), 3)
+    cv2.putText(slide, "Second line of text", (30, title_y + 80), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (20, 20, 20), 2)
+    return slide
+
+
+def make_fixture():
+    """
+    Build frame pairs of a slide transition.
+    
+    Returns:
+        tuple: (similar_pairs, different_pairs), lists of (name, frame1, frame2)
+    """
+    first = make_slide("Introduction")
+    second = make_slide("Results and methods", title_y=260)
+    noise = np.random.default_rng(0).integers(-3, 4, first.shape)
+    noisy = np.clip(first.astype(np.int64) + noise, 0, 255).astype(np.uint8)
+    recompressed = cv2.imdecode(cv2.imencode('.jpg', first, [cv2.IMWRITE_JPEG_QUALITY, 80])[1], cv2.IMREAD_COLOR)
+    
+    similar_pairs = [
+        ('identical', first, first.copy()),
+        ('noise', first, noisy),
+        ('jpeg', first, recompressed),
+    ]
+    different_pairs = [
+        (f'fade {alpha}', first, cv2.addWeighted(first, 1 - alpha, second, alpha, 0))
+        for alpha in (0.1, 0.25, 0.5, 0.75, 0.9)
+    ]
+    different_pairs.append(('next slide', first, second))
+    return similar_pairs, different_pairs
+
+
+def imagehash_distance(frame1, frame2):
+    """Distance between two BGR frames as computed by imagehash.phash (hash_size=32)."""
+    hashes = [imagehash.phash(Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)), hash_size=32)
+              for frame in (frame1, frame2)]
+    return hashes[0] - hashes[1]
+
+
+@unittest.skipIf(cv2 is None, "OpenCV, NumPy and the video_text_lib dependencies are required")
+class FrameHashTest(unittest.TestCase):
+
+    def test_threshold_decisions(self):
+        similar_pairs, different_pairs = make_fixture()
+        for name, frame1, frame2 in similar_pairs:
+            with self.subTest(name):
+                distance = hash_distance(compute_frame_hash(frame1), compute_frame_hash(frame2))
+                self.assertLessEqual(distance, DEFAULT_THRESHOLD)
+        for name, frame1, frame2 in different_pairs:
+            with self.subTest(name):
+                distance = hash_distance(compute_frame_hash(frame1), compute_frame_hash(frame2))
+                self.assertGreater(distance, DEFAULT_THRESHOLD)
+
+    @unittest.skipIf(imagehash is None, "imagehash is required")
+    def test_distances_close_to_imagehash(self):
+        similar_pairs, different_pairs = make_fixture()
+        for name, frame1, frame2 in similar_pairs + different_pairs:
+            with self.subTest(name):
+                distance = hash_distance(compute_frame_hash(frame1), compute_frame_hash(frame2))
+                expected = imagehash_distance(frame1, frame2)
+                self.assertLessEqual(abs(distance - expected), MAX_DISTANCE_DRIFT)
+                self.assertEqual(distance <= DEFAULT_THRESHOLD, expected <= DEFAULT_THRESHOLD)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for group_text_blocks(), which groups OCR words into lines and blocks.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from video_text_lib import group_text_blocks
+except ImportError:
+    group_text_blocks = None
+
+
+def make_words(words):
+    """Build the word columns group_text_blocks() takes from (value, x, y, width, height) tuples."""
+    columns = {'value': [], 'x': [], 'y': [], 'width': [], 'height': [], 'confidence': []}
+    for value, x, y, width, height in words:
+        for key, item in zip(('value', 'x', 'y', 'width', 'height'), (value, x, y, width, height)):
+            columns[key].append(item)
+        columns['confidence'].append(90.0)
+    return columns
+
+
+@unittest.skipIf(group_text_blocks is None, "OpenCV, NumPy and the video_text_lib dependencies are required")
+class GroupTextBlocksTest(unittest.TestCase):
+
+    def test_lines_are_stacked_into_blocks(self):
+        blocks = group_text_blocks(make_words([
+            ('Hello', 10, 10, 50, 20),
+            ('world', 70, 10, 50, 20),
+            ('again', 10, 40, 50, 20),
+        ]))
+        self.assertEqual([block['value'] for block in blocks], ['Hello world again'])
+        self.assertEqual(blocks[0]['line_count'], 2)
+
+    def test_zero_height_word_is_kept_apart(self):
+        # Tesseract can report empty boxes; they used to make the whole image return []
+        blocks = group_text_blocks(make_words([
+            ('Hello', 10, 10, 50, 20),
+            ('world', 70, 10, 50, 20),
+            ('again', 10, 40, 50, 20),
+            ('.', 65, 45, 5, 0),
+        ]))
+        values = sorted(block['value'] for block in blocks)
+        self.assertEqual(values, ['.', 'Hello world again'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the command-line scripts.
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+from contextlib import contextmanager
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'video_text_extractor'
+)
+TESSERACT_CACHE_FILE = os.path.join(CACHE_DIR, 'tess.json')
+
+# Output files are written in many small chunks, use a large buffer to limit write() calls
+WRITE_BUFFER_SIZE = 1 << 20
+
+_VERSION_PATTERN = re.compile(r'^\d+(\.\d+)*')
+
+
+def get_cached_tesseract_version():
+    """
+    Get the Tesseract version, reusing a cached probe when the binary hasn't changed.
+
+    Probing runs the tesseract binary, so the result is cached on disk keyed by
+    the binary path and modification time, and only re-probed when either changes.
+
+    Returns:
+        str: Tesseract version string
+
+    Raises:
+        pytesseract.TesseractNotFoundError: If Tesseract is not installed
+    """
+    import pytesseract
+
+    path = shutil.which(pytesseract.pytesseract.tesseract_cmd)
+    if path is None:
+        raise pytesseract.TesseractNotFoundError()
+    key = [path, os.stat(path).st_mtime_ns]
+
+    # Reuse the cached version if it belongs to the same binary and still parses
+    try:
+        cached = load_json(TESSERACT_CACHE_FILE)
+        version = cached.get('version')
+        if cached.get('key') == key and isinstance(version, str) and _VERSION_PATTERN.match(version):
+            return version
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    version = str(pytesseract.get_tesseract_version())
+
+    # Write the cache atomically; failing to cache is not an error
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with atomic_write(TESSERACT_CACHE_FILE) as f:
+            f.write(json_dumps_bytes({'key': key, 'version': version}))
+    except OSError:
+        pass
+
+    return version
+
+
+def require_tesseract():
+    """
+    Exit with installation instructions if Tesseract is not installed.
+
+    Only looks the binary up on PATH: running it to read its version is not
+    needed to know it's installed.
+    """
+    if shutil.which('tesseract') is None:
+        print("Error: Tesseract is not installed. Please install it first.", file=sys.stderr)
+        print("  Linux:   sudo apt-get install tesseract-ocr", file=sys.stderr)
+        print("  macOS:   brew install tesseract", file=sys.stderr)
+        print("  Windows: Download from https://github.com/UB-Mannheim/tesseract/wiki", file=sys.stderr)
+        sys.exit(1)
+
+
+def json_dumps_bytes(obj, indent=False):
+    """
+    Serialize an object to UTF-8 encoded JSON, using orjson when it is installed.
+
+    Args:
+        obj: JSON-serializable object
+        indent (bool): Pretty-print with 2-space indentation (default: compact)
+
+    Returns:
+        bytes: UTF-8 encoded JSON (no trailing newline)
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def load_json(path):
+    """
+    Load a JSON file, using orjson when it is installed.
+
+    Args:
+        path (str): JSON file path
+
+    Returns:
+        Parsed JSON data
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json_items(f, items, indent):
+    """
+    Stream items as the elements of a JSON array, one compact element per line.
+    
+    Items are consumed one at a time, so a generator can be passed to avoid
+    materializing the whole array in memory.
+    
+    Args:
+        f: Binary file object to write to
+        items: Iterable of JSON-serializable objects
+        indent (bytes): Prefix for each element line
+    """
+    separator = b''
+    for item in items:
+        f.write(separator)
+        f.write(indent)
+        f.write(json_dumps_bytes(item))
+        separator = b',\n'
+    if separator:
+        f.write(b'\n')
+
+
+@contextmanager
+def atomic_write(path, buffering=WRITE_BUFFER_SIZE):
+    """
+    Open a file for binary writing that only replaces `path` once fully written.
+
+    Data goes to a temporary file next to `path`, which is flushed, synced and
+    renamed over `path` on success, so readers never see a truncated file.
+
+    Args:
+        path (str): Destination file path
+        buffering (int): Write buffer size in bytes, as for open() (default: 1 MiB)
+
+    Yields:
+        file: Binary file object to write to
+    """
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb', buffering=buffering) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -8,28 +8,111 @@ and performing OCR text extraction. Can be used as a library or via CLI.
 
 import os
 import sys
+import atexit
+import heapq
+import queue
+import tempfile
+import multiprocessing
+import threading
+from array import array
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import cv2
 import numpy as np
-from PIL import Image
 import pytesseract
 from pytesseract import Output
-import imagehash
 from tqdm import tqdm
 
+# Encoding parameters of saved frames, by image format (file extension).
+# PNG is lossless at any level; level 1 compresses several times faster than
+# OpenCV's default (3) for slightly larger files. JPEG is much faster to encode
+# and smaller still, at the cost of compression artifacts around text.
+IMAGE_WRITE_PARAMS = {
+    'png': [cv2.IMWRITE_PNG_COMPRESSION, 1],
+    'jpg': [cv2.IMWRITE_JPEG_QUALITY, 92],
+}
 
-def calculate_blur_score(image):
+# Typical keyframe interval of videos: reaching a frame further away than that is
+# cheaper by seeking (decoding from the previous keyframe) than by decoding every frame
+SEEK_THRESHOLD_MS = 2000
+
+# Frames between two updates of the statistics shown next to the progress bar
+PROGRESS_POSTFIX_EVERY = 25
+
+# Max number of sampled frames kept in memory while waiting for their stability lookahead frame
+MAX_PEEK_FRAMES = 8
+
+# Frames decoded ahead by the decoding thread while the current one is filtered
+DECODE_PREFETCH_FRAMES = 4
+
+# Max frames read and hashed ahead, and max frames being written in the background, whatever
+# the number of hash workers; every buffered frame is a full BGR image (~6 MB at 1080p,
+# ~25 MB at 4K), so together with the prefetch and peek buffers at most ~28 frames are held
+MAX_READ_AHEAD_FRAMES = 8
+MAX_PENDING_WRITES = 8
+
+# Max difference between the 8x8 average hashes of two frames for the coarse
+# deduplication prefilter to call them duplicates without computing their pHash
+COARSE_DEDUPE_THRESHOLD = 2
+
+# Tesseract page segmentation mode used by default: fully automatic (Tesseract's own default)
+DEFAULT_PSM = 3
+
+# Upscaling factor of images preprocessed for OCR: Tesseract is most accurate on
+# text at least ~20 px tall, which small captions and slide footnotes are not
+OCR_UPSCALE = 2
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# Per-process tesserocr instance, see _get_tesserocr_api()
+_tesserocr_api = None
+
+# Per-process EasyOCR reader, see _get_easyocr_reader()
+_easyocr_reader = None
+
+try:
+    import av
+except ImportError:
+    av = None
+
+# int.bit_count() (Python 3.10+) is a single popcount, much faster than counting bin() digits
+if hasattr(int, 'bit_count'):
+    _popcount = int.bit_count
+else:
+    def _popcount(value):
+        return bin(value).count('1')
+
+
+def _to_gray(image):
+    """Convert a BGR image to grayscale, grayscale images are returned as is."""
+    return image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def calculate_blur_score(image, downscale=1):
     """
     Calculate blur score using Laplacian variance.
     
     Args:
-        image: OpenCV image (BGR format)
+        image: OpenCV image (BGR format, or already converted to grayscale)
+        downscale (int): Shrink the image by this factor first, which is much faster
+            but gives different scores than full resolution (default: 1, no downscaling)
         
     Returns:
         float: Laplacian variance (higher = sharper)
     """
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-    return laplacian_var
+    gray = _to_gray(image)
+    if downscale > 1:
+        gray = cv2.resize(gray, None, fx=1 / downscale, fy=1 / downscale, interpolation=cv2.INTER_AREA)
+    # float32 is plenty for a thresholded score and halves the memory traffic of float64
+    laplacian = cv2.Laplacian(gray, cv2.CV_32F)
+    
+    # OpenCV computes the variance in one vectorized pass, without NumPy's temporary arrays
+    _, std_dev = cv2.meanStdDev(laplacian)
+    return float(std_dev[0, 0]) ** 2
 
 
 def are_images_similar(hash1, hash2, threshold=20):
@@ -37,8 +120,8 @@ def are_images_similar(hash1, hash2, threshold=20):
     Compare two perceptual hashes to determine if images are similar.
     
     Args:
-        hash1: First image hash
-        hash2: Second image hash
+        hash1 (int): First image hash
+        hash2 (int): Second image hash
         threshold: Maximum hash difference for similarity (default: 20)
         
     Returns:
@@ -46,14 +129,343 @@ def are_images_similar(hash1, hash2, threshold=20):
     """
     if hash1 is None or hash2 is None:
         return False
-    return abs(hash1 - hash2) <= threshold
+    return hash_distance(hash1, hash2) <= threshold
 
 
-def extract_frames(video_path, interval_ms, deduplicate, filter_blurry, blur_threshold, images_dir, 
-                   check_stability=True, stability_threshold=20, stability_lookahead_ms=100, start_time_ms=0, 
-                   stop_time_ms=None, dedupe_threshold=20, debug=False):
+def hash_distance(hash1, hash2):
     """
-    Extract frames from video with optional blur filtering and deduplication.
+    Count the differing bits (Hamming distance) between two perceptual hashes.
+    
+    Args:
+        hash1 (int): First image hash
+        hash2 (int): Second image hash
+        
+    Returns:
+        int: Number of differing bits
+    """
+    return _popcount(hash1 ^ hash2)
+
+
+def compute_frame_hash(frame, hash_size=32):
+    """
+    Calculate the perceptual hash (pHash) of a video frame.
+    
+    Same recipe as imagehash.phash, done with OpenCV directly on the BGR frame:
+    grayscale, resize to 4x the hash size, DCT, then keep the low frequency
+    corner and compare each coefficient to its median.
+    
+    OpenCV's resize and DCT differ slightly from imagehash's (PIL and scipy), so
+    hash distances are close to the ones of imagehash.phash but not identical:
+    frames near a threshold can be classified differently.
+    
+    Args:
+        frame: OpenCV image (BGR format, or already converted to grayscale)
+        hash_size (int): pHash size, the hash has hash_size**2 bits (default: 32)
+        
+    Returns:
+        int: Perceptual hash of the frame, bits packed in an integer
+    """
+    img_size = hash_size * 4
+    gray = cv2.resize(_to_gray(frame), (img_size, img_size), interpolation=cv2.INTER_AREA)
+    dct = cv2.dct(gray.astype(np.float32))[:hash_size, :hash_size]
+    bits = dct > np.median(dct)
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def compute_average_hash(frame, hash_size=8):
+    """
+    Calculate the average hash (aHash) of a video frame.
+    
+    Much cheaper than compute_frame_hash() but also much coarser: each bit only
+    tells whether a block of the frame is brighter than the frame's mean.
+    
+    Args:
+        frame: OpenCV image (BGR format, or already converted to grayscale)
+        hash_size (int): aHash size, the hash has hash_size**2 bits (default: 8)
+        
+    Returns:
+        int: Average hash of the frame, bits packed in an integer
+    """
+    tiny = cv2.resize(_to_gray(frame), (hash_size, hash_size), interpolation=cv2.INTER_AREA)
+    return int.from_bytes(np.packbits(tiny > tiny.mean()).tobytes(), 'big')
+
+
+def open_video(video_path):
+    """
+    Open a video with OpenCV, using hardware-accelerated decoding when available.
+    
+    Hardware decoding (VAAPI, NVDEC, ...) needs OpenCV 4.5.2+ built with FFmpeg and a
+    supported GPU; otherwise the default (software) capture is used.
+    
+    Args:
+        video_path (str): Path to video file
+        
+    Returns:
+        cv2.VideoCapture: Video capture (check isOpened() before use)
+    """
+    if hasattr(cv2, 'VIDEO_ACCELERATION_ANY'):
+        try:
+            video = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG,
+                                     (cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY))
+            if video.isOpened():
+                return video
+        except cv2.error:
+            pass
+    return cv2.VideoCapture(video_path)
+
+
+def _decode_frames_cv2(video, fps, timestamps):
+    """
+    Decode the frames at the given timestamps with OpenCV.
+    
+    Frames in between timestamps are skipped with grab(), which doesn't convert
+    or copy them, instead of seeking for every timestamp (each seek restarts
+    decoding from the previous keyframe). Only when the next timestamp is more
+    than SEEK_THRESHOLD_MS away does seeking beat decoding every frame in between;
+    seeks are done by frame index, which is more precise than by time.
+    
+    Yields:
+        tuple: (timestamp_ms, frame) with frame in BGR format
+    """
+    next_index = None
+    frame = None
+    seek_threshold = SEEK_THRESHOLD_MS * fps / 1000
+    for timestamp_ms in timestamps:
+        target_index = int(round(timestamp_ms * fps / 1000))
+        if next_index is None or target_index - next_index > seek_threshold:
+            video.set(cv2.CAP_PROP_POS_FRAMES, target_index)
+            next_index = target_index
+        
+        # Timestamps closer than a frame apart can land on the frame just read
+        if frame is not None and target_index < next_index:
+            yield timestamp_ms, frame
+            continue
+        
+        # Skip frames up to the target one without retrieving them
+        success = True
+        while next_index < target_index and success:
+            success = video.grab()
+            next_index += 1
+        if success:
+            success, frame = video.read()
+            next_index += 1
+        if not success:
+            return
+        
+        yield timestamp_ms, frame
+
+
+def _decode_frames_av(video_path, timestamps):
+    """
+    Decode the frames at the given timestamps with PyAV.
+    
+    The video is decoded sequentially with FFmpeg's multithreaded decoding and
+    only the frames closest to each timestamp are converted to BGR arrays. As
+    with OpenCV, the decoder only seeks when the next timestamp is more than
+    SEEK_THRESHOLD_MS away.
+    
+    Yields:
+        tuple: (timestamp_ms, frame) with frame in BGR format
+    """
+    timestamps = iter(timestamps)
+    target_ms = next(timestamps, None)
+    
+    with av.open(video_path) as container:
+        stream = container.streams.video[0]
+        stream.thread_type = 'AUTO'
+        time_base = stream.time_base
+        start_pts = stream.start_time or 0
+        
+        # A frame is the closest one to a timestamp if it starts less than half a frame after it
+        half_frame_ms = 500 / float(stream.average_rate) if stream.average_rate else 0
+        
+        while target_ms is not None:
+            seek_target_ms = target_ms
+            container.seek(start_pts + int(target_ms / 1000 / time_base), stream=stream)
+            
+            for av_frame in container.decode(stream):
+                if av_frame.pts is None:
+                    continue
+                frame_ms = float((av_frame.pts - start_pts) * time_base * 1000)
+                
+                # Far from the next timestamp (and not just after seeking to it): seek again
+                if target_ms - frame_ms > SEEK_THRESHOLD_MS and target_ms != seek_target_ms:
+                    break
+                
+                if frame_ms + half_frame_ms < target_ms:
+                    continue
+                
+                frame = av_frame.to_ndarray(format='bgr24')
+                while target_ms is not None and frame_ms + half_frame_ms >= target_ms:
+                    yield target_ms, frame
+                    target_ms = next(timestamps, None)
+                if target_ms is None:
+                    return
+            else:
+                # End of the video
+                return
+
+
+def _prefetch(iterable, size):
+    """
+    Iterate over `iterable` in a background thread, running up to `size` items ahead.
+    
+    Decoding (FFmpeg or OpenCV, both release the GIL) then overlaps with the
+    processing of the frames already decoded. Exceptions raised by `iterable`
+    are re-raised in the consuming thread. Closing this generator stops the
+    thread and closes `iterable` (from that thread) before returning.
+    
+    Args:
+        iterable (iterable): Items to produce, e.g. decoded (timestamp_ms, frame) tuples
+        size (int): Max number of items produced but not yet consumed
+    
+    Yields:
+        Items of `iterable`, in order
+    """
+    items = queue.Queue(maxsize=size)
+    stop = threading.Event()
+    done = object()
+    
+    def put(entry):
+        # Give up if the consumer went away, instead of blocking on a full queue forever
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def produce():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except BaseException as e:
+            put((done, e))
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+    
+    thread = threading.Thread(target=produce, name='frame-decoder', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _gray_and_hash(frame, hash_size):
+    """Convert a frame to grayscale and hash it, returning both (background hashing task)."""
+    gray = _to_gray(frame)
+    if hash_size is None:
+        # Nothing compares hashes, only the grayscale frame is needed
+        return gray, None
+    return gray, compute_frame_hash(gray, hash_size)
+
+
+def _read_frames(decoded_frames, hash_size, executor=None, window=0):
+    """
+    Read decoded frames, optionally hashing them ahead of time.
+    
+    With an executor, up to `window` frames are read ahead of the one being
+    yielded and their hashes are computed in the background meanwhile.
+    
+    Args:
+        decoded_frames (iterable): (timestamp_ms, frame) tuples
+        hash_size (int): Hash size, or None to only convert frames to grayscale
+        executor (Executor): Executor running the background tasks, or None to not read ahead
+        window (int): Number of frames read ahead
+    
+    Yields:
+        tuple: (timestamp_ms, frame, hash_future) where hash_future is None without executor,
+            and otherwise resolves to the (grayscale frame, hash) pair
+    """
+    pending = deque()
+    for timestamp_ms, frame in decoded_frames:
+        hash_future = executor.submit(_gray_and_hash, frame, hash_size) if executor else None
+        pending.append((timestamp_ms, frame, hash_future))
+        if len(pending) > window:
+            yield pending.popleft()
+    
+    while pending:
+        yield pending.popleft()
+
+
+def _merge_timestamps(*timestamp_lists):
+    """Merge sorted timestamp sequences into one sorted sequence without duplicates."""
+    previous = None
+    for timestamp_ms in heapq.merge(*timestamp_lists):
+        if timestamp_ms != previous:
+            yield timestamp_ms
+            previous = timestamp_ms
+
+
+def _pair_lookahead(frames, sample_timestamps, lookahead_ms):
+    """
+    Pair each sampled frame with its stability lookahead frame.
+    
+    Sampled frames are held back until the frame `lookahead_ms` after them has
+    been read, so both come out of the same sequential pass over the video.
+    
+    Args:
+        frames (iterable): (timestamp_ms, frame, hash_future) tuples for both sampled
+            and lookahead timestamps, in order
+        sample_timestamps: Container of the sampled timestamps
+        lookahead_ms (int): Lookahead delay in milliseconds (> 0)
+    
+    Yields:
+        tuple: (sampled_entry, lookahead_entry) where lookahead_entry is None if the
+            video ended before it
+    """
+    waiting = deque()
+    for entry in frames:
+        timestamp_ms = entry[0]
+        while waiting and waiting[0][0] + lookahead_ms <= timestamp_ms:
+            sampled_entry = waiting.popleft()
+            yield sampled_entry, entry if sampled_entry[0] + lookahead_ms == timestamp_ms else None
+        if timestamp_ms in sample_timestamps:
+            waiting.append(entry)
+    while waiting:
+        yield waiting.popleft(), None
+
+
+def _progress_postfix(stats):
+    """Format extraction statistics for the progress bar."""
+    return f"{stats['saved']} saved | {stats['blurry']} blurry | {stats['duplicates']} duplicates | {stats['unstable']} unstable"
+
+
+def _advance_progress(pbar, stats):
+    """
+    Advance the progress bar by one frame.
+    
+    The statistics postfix is only reformatted every PROGRESS_POSTFIX_EVERY frames,
+    and without forcing a redraw: tqdm repaints on its own at most every `mininterval`.
+    """
+    if stats['processed'] % PROGRESS_POSTFIX_EVERY == 0:
+        pbar.set_postfix_str(_progress_postfix(stats), refresh=False)
+    pbar.update(1)
+
+
+def iter_frames(video_path, interval_ms, deduplicate, filter_blurry, blur_threshold, images_dir, 
+                check_stability=True, stability_threshold=20, stability_lookahead_ms=100, start_time_ms=0, 
+                stop_time_ms=None, dedupe_threshold=20, debug=False, stats=None, debug_info=None,
+                debug_arrays=None, hash_workers=1, blur_downscale=1, image_format='png', coarse_dedupe=False):
+    """
+    Extract frames from video, yielding each saved frame as soon as it is written.
+    
+    Generator version of `extract_frames`, so callers can process frames while
+    extraction is still running instead of waiting for the full list.
     
     Args:
         video_path (str): Path to input video file
@@ -61,27 +473,41 @@ def extract_frames(video_path, interval_ms, deduplicate, filter_blurry, blur_thr
         deduplicate (bool): Whether to skip duplicate frames
         filter_blurry (bool): Whether to skip blurry frames
         blur_threshold (float): Laplacian variance threshold for blur detection
-        images_dir (str): Directory to save extracted images
+        images_dir (str): Directory to save extracted images, or None to not write them
+            and yield the frames themselves instead
         check_stability (bool): Whether to check if frame is stable (not in transition) (default: True)
         stability_threshold (int): Max hash difference for frames to be considered stable (default: 20)
         stability_lookahead_ms (int): How many ms ahead to check for stability (default: 100)
         start_time_ms (int): Start time in milliseconds (default: 0)
         stop_time_ms (int, optional): Stop time in milliseconds (None = entire video)
         dedupe_threshold (int): Max hash difference for frames to be considered duplicates (default: 20)
-        debug (bool): Whether to collect and return debug information
+        debug (bool): Whether to collect debug information
+        stats (dict, optional): Dictionary updated in place with extraction statistics
+        debug_info (list, optional): List that debug information dictionaries are appended to
+        debug_arrays (dict, optional): Dictionary filled with per-frame debug scores stored
+            column-wise ('timestamp_ms', 'stability_score', 'duplicate_score' arrays,
+            NaN for missing scores), convenient for plotting
+        hash_workers (int): Number of threads hashing upcoming frames and writing saved ones
+            in the background while the current one is processed; above 1, frames are also
+            decoded ahead in a thread of their own; this buffers up to about 28 full frames
+            (~700 MB at 4K) whatever the number of workers (default: 1, all inline)
+        blur_downscale (int): Factor frames are shrunk by before computing their blur score
+            (default: 1, full resolution; blur_threshold must be tuned accordingly)
+        image_format (str): 'png' (lossless, default) or 'jpg' (faster to write, smaller files)
+        coarse_dedupe (bool): Call frames duplicates when their 8x8 average hash matches the last
+            saved frame's, without computing their pHash. Faster on static content, but small
+            changes such as a new line of text can go unnoticed (default: False, ignored in debug mode)
         
-    Returns:
-        tuple: (saved_frames, stats, debug_info)
-            - saved_frames: List of tuples (image_path, timestamp_ms) for saved frames
-            - stats: Dictionary with extraction statistics
-            - debug_info: List of debug information dictionaries (empty if debug=False)
+    Yields:
+        tuple: (image_path, timestamp_ms) for each saved frame, or (frame, timestamp_ms)
+            with the frame as an OpenCV image (BGR format) when images_dir is None
     """
     # Check if video file exists
     if not os.path.exists(video_path):
         raise FileNotFoundError(f"Video file not found: {video_path}")
     
     # Open video
-    video = cv2.VideoCapture(video_path)
+    video = open_video(video_path)
     if not video.isOpened():
         raise ValueError("Cannot open video file. Unsupported format or codec.")
     
@@ -107,354 +533,900 @@ def extract_frames(video_path, interval_ms, deduplicate, filter_blurry, blur_thr
     duration_to_process = end_time_ms - start_time_ms
     num_frames_to_extract = (duration_to_process // interval_ms) + 1
     
+    if image_format not in IMAGE_WRITE_PARAMS:
+        raise ValueError(f"Unsupported image format: {image_format}")
+    write_params = IMAGE_WRITE_PARAMS[image_format]
+    
     # Create output directory
-    os.makedirs(images_dir, exist_ok=True)
+    if images_dir is not None:
+        os.makedirs(images_dir, exist_ok=True)
     
     # Initialize tracking variables
-    saved_frames = []
-    debug_info = []
+    if stats is None:
+        stats = {}
+    if debug_info is None:
+        debug_info = []
     last_hash = None
-    stats = {
+    last_average_hash = None
+    stats.update({
         'processed': 0,
         'saved': 0,
         'blurry': 0,
         'duplicates': 0,
         'unstable': 0
-    }
+    })
+    if debug_arrays is not None:
+        debug_arrays.update({
+            'timestamp_ms': array('q'),
+            'stability_score': array('f'),
+            'duplicate_score': array('f')
+        })
+    
+    # Lookahead frames are decoded in the same sequential pass as the sampled frames,
+    # which keeps the sampled frames of the last stability_lookahead_ms in memory. For
+    # long lookaheads (more than MAX_PEEK_FRAMES frames) they are read from a second
+    # capture instead. Lookahead frames that are also sampled frames are hashed once.
+    need_lookahead = check_stability or debug
+    inline_lookahead = need_lookahead and 0 < stability_lookahead_ms <= MAX_PEEK_FRAMES * interval_ms
+    lookahead_video = open_video(video_path) if need_lookahead and not inline_lookahead else None
+    frame_hashes = {}
+    
+    # Frames are only hashed to compare them, skip it when nothing compares them
+    need_hash = deduplicate or need_lookahead
+    
+    # Hash upcoming frames and write saved ones in background threads (OpenCV releases the GIL).
+    # The video isn't split into time segments processed in parallel: each frame is deduplicated
+    # against the last saved one and its stability lookahead can fall past a segment boundary, so
+    # independent segments would save different frames than a single sequential pass
+    executor = ThreadPoolExecutor(max_workers=hash_workers) if hash_workers > 1 else None
+    pending_writes = deque()
     
     # Progress bar
-    pbar = tqdm(total=num_frames_to_extract, desc="Extracting frames", unit="frame")
+    pbar = tqdm(total=num_frames_to_extract, desc="Extracting frames", unit="frame", mininterval=0.25)
     
-    # Extract frames at intervals starting from start_time_ms
-    timestamp_ms = start_time_ms
-    while timestamp_ms <= end_time_ms:
-        # Set video position
-        video.set(cv2.CAP_PROP_POS_MSEC, timestamp_ms)
-        success, frame = video.read()
-        
-        if not success:
-            break
-        
-        stats['processed'] += 1
-        
-        # Initialize debug data for this frame
-        frame_debug = {
-            'timestamp_ms': timestamp_ms,
-            'reason': None
-        } if debug else None
+    decoded_frames = None
+    try:
+        # Extract frames at intervals starting from start_time_ms
+        timestamps = range(start_time_ms, end_time_ms + 1, interval_ms)
+        decode_timestamps = timestamps
+        if inline_lookahead:
+            lookahead_timestamps = range(start_time_ms + stability_lookahead_ms,
+                                         end_time_ms + stability_lookahead_ms + 1, interval_ms)
+            decode_timestamps = _merge_timestamps(timestamps, lookahead_timestamps)
         
-        # Track if frame should be filtered (but in debug mode we save anyway)
-        should_skip = False
-        skip_reason = None
+        if av is not None:
+            decoded_frames = _decode_frames_av(video_path, decode_timestamps)
+        else:
+            decoded_frames = _decode_frames_cv2(video, fps, decode_timestamps)
+        if executor:
+            # Decode in a thread of its own, hashing and writing use the executor's
+            decoded_frames = _prefetch(decoded_frames, DECODE_PREFETCH_FRAMES)
+        frames = _read_frames(decoded_frames, hash_size if need_hash else None, executor, window=min(2 * hash_workers, MAX_READ_AHEAD_FRAMES) if executor else 0)
+        if inline_lookahead:
+            frames = _pair_lookahead(frames, timestamps, stability_lookahead_ms)
+        else:
+            frames = ((entry, None) for entry in frames)
         
-        # Check blur
-        blur_score = None
-        if filter_blurry or debug:
-            blur_score = calculate_blur_score(frame)
-            if debug:
-                frame_debug['blur_score'] = round(blur_score, 2)
-            if filter_blurry and blur_score < blur_threshold:
-                stats['blurry'] += 1
-                if not debug:
-                    pbar.set_postfix_str(f"{stats['saved']} saved | {stats['blurry']} blurry | {stats['duplicates']} duplicates | {stats['unstable']} unstable")
-                    pbar.update(1)
-                    timestamp_ms += interval_ms
-                    continue
-                else:
-                    should_skip = True
-                    skip_reason = 'blurry'
-        elif debug:
-            frame_debug['blur_score'] = None
-        
-        # Calculate hash for deduplication and stability check
-        frame_pil = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        current_hash = imagehash.phash(frame_pil, hash_size=hash_size)
-        
-        # Check deduplication
-        hash_diff = None
-        if (deduplicate or debug) and last_hash is not None:
-            hash_diff = abs(current_hash - last_hash)
-            if debug:
-                frame_debug['duplicate_score'] = int(hash_diff)
-        
-        if deduplicate and are_images_similar(current_hash, last_hash, threshold=dedupe_threshold):
-            stats['duplicates'] += 1
-            if not debug:
-                pbar.set_postfix_str(f"{stats['saved']} saved | {stats['blurry']} blurry | {stats['duplicates']} duplicates | {stats['unstable']} unstable")
-                pbar.update(1)
-                timestamp_ms += interval_ms
-                continue
+        for (timestamp_ms, frame, hash_future), lookahead_entry in frames:
+            stats['processed'] += 1
+            cached_hash = frame_hashes.pop(timestamp_ms, None)
+            
+            # Initialize debug data for this frame
+            frame_debug = {
+                'timestamp_ms': timestamp_ms,
+                'reason': None
+            } if debug else None
+            
+            # Track if frame should be filtered (but in debug mode we save anyway)
+            should_skip = False
+            skip_reason = None
+            
+            # Convert to grayscale only once for both blur check and hashing
+            # (background hashing threads hand back the one they made)
+            if hash_future:
+                gray, background_hash = hash_future.result()
             else:
-                should_skip = True
-                skip_reason = 'duplicate'
-        
-        # Check stability (if enabled)
-        is_stable = True
-        stability_score = 0
-        if check_stability or debug:
-            # Get frame at lookahead position
-            lookahead_timestamp = timestamp_ms + stability_lookahead_ms
-            video.set(cv2.CAP_PROP_POS_MSEC, lookahead_timestamp)
-            success_lookahead, frame_lookahead = video.read()
+                gray, background_hash = frame, None
             
-            if success_lookahead:
-                frame_lookahead_pil = Image.fromarray(cv2.cvtColor(frame_lookahead, cv2.COLOR_BGR2RGB))
-                lookahead_hash = imagehash.phash(frame_lookahead_pil, hash_size=hash_size)
-                stability_score = abs(current_hash - lookahead_hash)
-                
+            # Check blur
+            blur_score = None
+            if filter_blurry or debug:
+                gray = _to_gray(gray)
+                blur_score = calculate_blur_score(gray, blur_downscale)
                 if debug:
-                    frame_debug['stability_score'] = int(stability_score)
-                
-                if check_stability and stability_score > stability_threshold:
-                    stats['unstable'] += 1
+                    frame_debug['blur_score'] = round(blur_score, 2)
+                if filter_blurry and blur_score < blur_threshold:
+                    stats['blurry'] += 1
                     if not debug:
-                        pbar.set_postfix_str(f"{stats['saved']} saved | {stats['blurry']} blurry | {stats['duplicates']} duplicates | {stats['unstable']} unstable")
-                        pbar.update(1)
-                        timestamp_ms += interval_ms
+                        _advance_progress(pbar, stats)
                         continue
                     else:
                         should_skip = True
-                        skip_reason = 'unstable'
-        
-        # Save frame (always save in debug mode, even if it would be filtered)
-        image_filename = f"{timestamp_ms:07d}.png"
+                        skip_reason = 'blurry'
+            elif debug:
+                frame_debug['blur_score'] = None
+            
+            # Coarse deduplication prefilter, only worth it when the pHash isn't already
+            # computed (by background threads or as an earlier frame's lookahead)
+            current_average_hash = None
+            if coarse_dedupe and deduplicate and not debug and cached_hash is None and background_hash is None:
+                current_average_hash = compute_average_hash(gray)
+                if (last_average_hash is not None
+                        and hash_distance(current_average_hash, last_average_hash) <= COARSE_DEDUPE_THRESHOLD):
+                    stats['duplicates'] += 1
+                    _advance_progress(pbar, stats)
+                    continue
+            
+            # Calculate hash for deduplication and stability check
+            if not need_hash:
+                current_hash = None
+            elif cached_hash is not None:
+                current_hash = cached_hash
+            elif background_hash is not None:
+                current_hash = background_hash
+            else:
+                current_hash = compute_frame_hash(gray, hash_size)
+            
+            # Check deduplication
+            hash_diff = None
+            if (deduplicate or debug) and last_hash is not None:
+                hash_diff = hash_distance(current_hash, last_hash)
+                if debug:
+                    frame_debug['duplicate_score'] = int(hash_diff)
+            
+            if deduplicate and are_images_similar(current_hash, last_hash, threshold=dedupe_threshold):
+                stats['duplicates'] += 1
+                if not debug:
+                    _advance_progress(pbar, stats)
+                    continue
+                else:
+                    should_skip = True
+                    skip_reason = 'duplicate'
+            
+            # Check stability (if enabled)
+            is_stable = True
+            stability_score = 0
+            if check_stability or debug:
+                # Get frame at lookahead position
+                if inline_lookahead:
+                    success_lookahead = lookahead_entry is not None
+                    if success_lookahead:
+                        lookahead_timestamp, frame_lookahead, lookahead_future = lookahead_entry
+                        if lookahead_future:
+                            _, lookahead_hash = lookahead_future.result()
+                        else:
+                            lookahead_hash = compute_frame_hash(frame_lookahead, hash_size)
+                        
+                        # Hash it once if it's also a sampled frame, it's reused when its turn comes
+                        if lookahead_timestamp in timestamps:
+                            frame_hashes[lookahead_timestamp] = lookahead_hash
+                else:
+                    lookahead_timestamp = timestamp_ms + stability_lookahead_ms
+                    lookahead_video.set(cv2.CAP_PROP_POS_FRAMES, int(round(lookahead_timestamp * fps / 1000)))
+                    success_lookahead, frame_lookahead = lookahead_video.read()
+                    if success_lookahead:
+                        lookahead_hash = compute_frame_hash(frame_lookahead, hash_size)
+                
+                if success_lookahead:
+                    stability_score = hash_distance(current_hash, lookahead_hash)
+                    
+                    if debug:
+                        frame_debug['stability_score'] = int(stability_score)
+                    
+                    if check_stability and stability_score > stability_threshold:
+                        stats['unstable'] += 1
+                        if not debug:
+                            _advance_progress(pbar, stats)
+                            continue
+                        else:
+                            should_skip = True
+                            skip_reason = 'unstable'
+            
+            # Save frame (always save in debug mode, even if it would be filtered)
+            image_filename = f"{timestamp_ms:07d}.{image_format}"
+            
+            # In debug mode, add -r suffix to rejected frame filenames
+            if debug and should_skip:
+                image_filename = f"{timestamp_ms:07d}-r.{image_format}"
+            
+            if images_dir is None:
+                # Frames are only kept in memory
+                pass
+            elif executor:
+                image_path = os.path.join(images_dir, image_filename)
+                # Write in a background thread (OpenCV releases the GIL while encoding),
+                # the frame is yielded once written
+                write_future = executor.submit(cv2.imwrite, image_path, frame, write_params)
+                pending_writes.append((write_future, image_path, timestamp_ms))
+            else:
+                image_path = os.path.join(images_dir, image_filename)
+                cv2.imwrite(image_path, frame, write_params)
+            
+            # Update stats and tracking
+            if not should_skip:
+                stats['saved'] += 1
+            
+            last_hash = current_hash
+            if coarse_dedupe and deduplicate and not debug:
+                last_average_hash = (current_average_hash if current_average_hash is not None
+                                     else compute_average_hash(gray))
+            
+            # Add debug info for frame
+            if debug:
+                frame_debug['reason'] = skip_reason if should_skip else 'saved'
+                frame_debug['filename'] = image_filename
+                if not (check_stability or debug):  # Add stability info if not already added
+                    frame_debug['stability_score'] = int(stability_score) if stability_score else None
+                debug_info.append(frame_debug)
+                if debug_arrays is not None:
+                    stability = frame_debug.get('stability_score')
+                    duplicate = frame_debug.get('duplicate_score')
+                    debug_arrays['timestamp_ms'].append(timestamp_ms)
+                    debug_arrays['stability_score'].append(np.nan if stability is None else stability)
+                    debug_arrays['duplicate_score'].append(np.nan if duplicate is None else duplicate)
+            
+            _advance_progress(pbar, stats)
+            
+            if images_dir is None:
+                yield frame, timestamp_ms
+            elif executor:
+                # Yield written frames in order, without letting too many writes pile up
+                while pending_writes and (len(pending_writes) > min(hash_workers, MAX_PENDING_WRITES) or pending_writes[0][0].done()):
+                    write_future, written_path, written_timestamp = pending_writes.popleft()
+                    write_future.result()
+                    yield written_path, written_timestamp
+            elif not should_skip or debug:
+                yield image_path, timestamp_ms
         
-        # In debug mode, add -r suffix to rejected frame filenames
-        if debug and should_skip:
-            image_filename = f"{timestamp_ms:07d}-r.png"
+        # Frames still being written at the end
+        while pending_writes:
+            write_future, written_path, written_timestamp = pending_writes.popleft()
+            write_future.result()
+            yield written_path, written_timestamp
+    finally:
+        pbar.set_postfix_str(_progress_postfix(stats), refresh=False)
+        pbar.close()
+        if decoded_frames is not None:
+            # Stop decoding (and the decoding thread) before releasing the capture
+            decoded_frames.close()
+        video.release()
+        if lookahead_video is not None:
+            lookahead_video.release()
+        if executor:
+            executor.shutdown()
+
+
+def extract_frames(video_path, interval_ms, deduplicate, filter_blurry, blur_threshold, images_dir, 
+                   check_stability=True, stability_threshold=20, stability_lookahead_ms=100, start_time_ms=0, 
+                   stop_time_ms=None, dedupe_threshold=20, debug=False, hash_workers=1, blur_downscale=1,
+                   image_format='png', coarse_dedupe=False):
+    """
+    Extract frames from video with optional blur filtering and deduplication.
+    
+    Args:
+        video_path (str): Path to input video file
+        interval_ms (int): Time interval in milliseconds between frame captures
+        deduplicate (bool): Whether to skip duplicate frames
+        filter_blurry (bool): Whether to skip blurry frames
+        blur_threshold (float): Laplacian variance threshold for blur detection
+        images_dir (str): Directory to save extracted images, or None to keep them in memory
+        check_stability (bool): Whether to check if frame is stable (not in transition) (default: True)
+        stability_threshold (int): Max hash difference for frames to be considered stable (default: 20)
+        stability_lookahead_ms (int): How many ms ahead to check for stability (default: 100)
+        start_time_ms (int): Start time in milliseconds (default: 0)
+        stop_time_ms (int, optional): Stop time in milliseconds (None = entire video)
+        dedupe_threshold (int): Max hash difference for frames to be considered duplicates (default: 20)
+        debug (bool): Whether to collect and return debug information
+        hash_workers (int): Number of threads hashing and writing frames in the background (default: 1)
+        blur_downscale (int): Factor frames are shrunk by before computing their blur score (default: 1)
+        image_format (str): 'png' (default) or 'jpg'
+        coarse_dedupe (bool): Skip frames whose 8x8 average hash matches the last saved frame's (default: False)
         
-        image_path = os.path.join(images_dir, image_filename)
-        cv2.imwrite(image_path, frame)
+    Returns:
+        tuple: (saved_frames, stats, debug_info)
+            - saved_frames: List of tuples (image_path, timestamp_ms) for saved frames
+              ((frame, timestamp_ms) when images_dir is None)
+            - stats: Dictionary with extraction statistics
+            - debug_info: List of debug information dictionaries (empty if debug=False)
+    """
+    stats = {}
+    debug_info = []
+    saved_frames = list(iter_frames(
+        video_path, interval_ms, deduplicate, filter_blurry, blur_threshold, images_dir,
+        check_stability, stability_threshold, stability_lookahead_ms, start_time_ms,
+        stop_time_ms, dedupe_threshold, debug, stats=stats, debug_info=debug_info,
+        hash_workers=hash_workers, blur_downscale=blur_downscale, image_format=image_format,
+        coarse_dedupe=coarse_dedupe
+    ))
+    return saved_frames, stats, debug_info
+
+
+def _new_word_columns():
+    """Empty word columns, see group_text_blocks()."""
+    return {'value': [], 'x': [], 'y': [], 'width': [], 'height': [], 'confidence': []}
+
+
+def _raw_blocks_from_ocr_data(ocr_data):
+    """
+    Collect high-confidence word blocks from pytesseract `image_to_data` output.
+    
+    Args:
+        ocr_data (dict): Output of `pytesseract.image_to_data` with `Output.DICT`
         
-        # Update stats and tracking
-        if not should_skip or debug:
-            saved_frames.append((image_path, timestamp_ms))
-            if not should_skip:
-                stats['saved'] += 1
+    Returns:
+        dict: Word columns (value, position, size, confidence), see group_text_blocks()
+    """
+    texts = [text.strip() for text in ocr_data['text']]
+    confidences = np.asarray(ocr_data['conf'], dtype=np.float64)
+    
+    # Filter out low confidence and empty text
+    keep = np.flatnonzero((confidences >= 70) & np.array([bool(text) for text in texts], dtype=bool))
+    
+    return {
+        'value': [texts[i] for i in keep],
+        'x': np.asarray(ocr_data['left'], dtype=np.int64)[keep],
+        'y': np.asarray(ocr_data['top'], dtype=np.int64)[keep],
+        'width': np.asarray(ocr_data['width'], dtype=np.int64)[keep],
+        'height': np.asarray(ocr_data['height'], dtype=np.int64)[keep],
+        'confidence': [round(float(confidence), 1) for confidence in confidences[keep]]
+    }
+
+
+def _raw_blocks_from_tesserocr(api):
+    """
+    Recognize the image currently set on a tesserocr API and collect high-confidence word blocks.
+    
+    Args:
+        api: `tesserocr.PyTessBaseAPI` with an image already set
         
-        last_hash = current_hash
+    Returns:
+        dict: Word columns (value, position, size, confidence), see group_text_blocks()
+    """
+    raw_blocks = _new_word_columns()
+    
+    api.Recognize()
+    iterator = api.GetIterator()
+    if iterator is None:
+        return raw_blocks
+    
+    level = tesserocr.RIL.WORD
+    
+    for word in tesserocr.iterate_level(iterator, level):
+        text = (word.GetUTF8Text(level) or '').strip()
+        confidence = word.Confidence(level)
         
-        # Add debug info for frame
-        if debug:
-            frame_debug['reason'] = skip_reason if should_skip else 'saved'
-            frame_debug['filename'] = image_filename
-            if not (check_stability or debug):  # Add stability info if not already added
-                frame_debug['stability_score'] = int(stability_score) if stability_score else None
-            debug_info.append(frame_debug)
+        # Filter out low confidence and empty text
+        if confidence < 70 or not text:
+            continue
         
-        pbar.set_postfix_str(f"{stats['saved']} saved | {stats['blurry']} blurry | {stats['duplicates']} duplicates | {stats['unstable']} unstable")
-        pbar.update(1)
+        x1, y1, x2, y2 = word.BoundingBox(level)
+        raw_blocks['value'].append(text)
+        raw_blocks['x'].append(x1)
+        raw_blocks['y'].append(y1)
+        raw_blocks['width'].append(x2 - x1)
+        raw_blocks['height'].append(y2 - y1)
+        raw_blocks['confidence'].append(round(confidence, 1))
+    
+    return raw_blocks
+
+
+def _raw_blocks_from_easyocr(detections):
+    """
+    Collect high-confidence text blocks from EasyOCR `readtext` output.
+    
+    Args:
+        detections (list): (bbox, text, confidence) tuples, bbox being 4 corner points
+            and confidence between 0 and 1
         
-        timestamp_ms += interval_ms
+    Returns:
+        dict: Word columns (value, position, size, confidence), see group_text_blocks()
+    """
+    raw_blocks = _new_word_columns()
     
-    pbar.close()
-    video.release()
+    for bbox, text, confidence in detections:
+        confidence = float(confidence) * 100
+        text = text.strip()
+        
+        # Filter out low confidence and empty text
+        if confidence < 70 or not text:
+            continue
+        
+        xs = [point[0] for point in bbox]
+        ys = [point[1] for point in bbox]
+        x, y = int(min(xs)), int(min(ys))
+        raw_blocks['value'].append(text)
+        raw_blocks['x'].append(x)
+        raw_blocks['y'].append(y)
+        raw_blocks['width'].append(int(max(xs)) - x)
+        raw_blocks['height'].append(int(max(ys)) - y)
+        raw_blocks['confidence'].append(round(confidence, 1))
     
-    return saved_frames, stats, debug_info
+    return raw_blocks
 
 
-def extract_text_from_image(image_path, join_char='space'):
+def group_text_blocks(raw_blocks, join_char='space'):
     """
-    Extract text from an image using OCR with intelligent grouping.
+    Group word blocks into lines (horizontal) and then multi-line blocks (vertical).
     
-    Groups text blocks into lines (horizontal) and then multi-line blocks (vertical).
     Uses a clustering approach to handle variable baselines and text positions.
     
+    Words are given column-wise (one list or array per field, all the same length)
+    rather than as one dictionary per word, so positions can be processed as arrays.
+    
     Args:
-        image_path (str): Path to image file
+        raw_blocks (dict): Word columns: 'value' (str), 'x', 'y', 'width', 'height' (int)
+            and 'confidence' (float)
         join_char (str): 'space' or 'newline' to join multi-line text
-        
+    
     Returns:
         list: List of dictionaries containing text blocks with position and confidence
     """
-    try:
-        # Load image
-        img = Image.open(image_path)
+    values = raw_blocks['value']
+    if not values:
+        return []
+    confidences = raw_blocks['confidence']
+    
+    # STAGE 1: Group blocks into lines (horizontal alignment)
+    # Use a smarter clustering approach instead of simple sorting
+    lines = []
+    
+    # Decide once, for every pair of blocks, whether they can be on the same line:
+    # vertically aligned, similar height and horizontally close
+    x = np.asarray(raw_blocks['x'], dtype=np.int64)
+    y = np.asarray(raw_blocks['y'], dtype=np.int64)
+    height = np.asarray(raw_blocks['height'], dtype=np.int64)
+    right = x + np.asarray(raw_blocks['width'], dtype=np.int64)
+    bottom = y + height
+    
+    # Only blocks at most 10 px apart vertically can be on the same line, so with
+    # blocks sorted by y, each one is only paired with the blocks of its y window
+    # instead of with every other block
+    by_y = np.argsort(y, kind='stable')
+    sorted_y = y[by_y]
+    window_start = np.searchsorted(sorted_y, sorted_y - 10, side='left')
+    window_size = np.searchsorted(sorted_y, sorted_y + 10, side='right') - window_start
+    first = np.repeat(by_y, window_size)
+    offsets = np.arange(first.size) - np.repeat(np.cumsum(window_size) - window_size, window_size)
+    second = by_y[np.repeat(window_start, window_size) + offsets]
+    
+    vertical_distance = np.abs(y[first] - y[second])
+    # Height ratio of at most 1.5, compared in integers as 2 * max <= 3 * min;
+    # zero-height blocks are excluded from matching and stay lines of their own
+    min_height = np.minimum(height[first], height[second])
+    similar_height = (min_height > 0) & (2 * np.maximum(height[first], height[second]) <= 3 * min_height)
+    horizontal_gap = np.minimum(np.abs(x[first] - right[second]), np.abs(x[second] - right[first]))
+    same_line = (vertical_distance <= 10) & similar_height & (horizontal_gap < 100) & (first != second)
+    first, second = first[same_line], second[same_line]
+    
+    # Blocks each block can be on the same line with, by increasing index
+    pair_order = np.lexsort((second, first))
+    neighbors = second[pair_order].tolist()
+    neighbors_start = np.searchsorted(first[pair_order], np.arange(len(values) + 1)).tolist()
+    
+    unused = [True] * len(values)
+    
+    # Use blocks as line seeds from left to right
+    for idx in np.argsort(x, kind='stable').tolist():
+        if not unused[idx]:
+            continue
         
-        # Perform OCR
-        ocr_data = pytesseract.image_to_data(img, output_type=Output.DICT)
+        # Start a new line with this seed block
+        current_line = [idx]
+        unused[idx] = False
         
-        # Filter and collect high-confidence text blocks
-        n_boxes = len(ocr_data['text'])
-        raw_blocks = []
+        # Blocks that can join a block already in the current line, smallest index first
+        joinable = neighbors[neighbors_start[idx]:neighbors_start[idx + 1]]
         
-        for i in range(n_boxes):
-            confidence = float(ocr_data['conf'][i])
-            text = ocr_data['text'][i].strip()
-            
-            # Filter out low confidence and empty text
-            if confidence < 70 or not text:
+        # Scan through remaining blocks in order (once) and add those that can join:
+        # blocks before the last one added are not considered again
+        j = 0
+        while joinable:
+            candidate = heapq.heappop(joinable)
+            if candidate < j or not unused[candidate]:
                 continue
+            current_line.append(candidate)
+            unused[candidate] = False
+            j = candidate + 1
+            for neighbor in neighbors[neighbors_start[candidate]:neighbors_start[candidate + 1]]:
+                heapq.heappush(joinable, neighbor)
+        
+        # Sort blocks in this line from left to right
+        current_line = np.asarray(current_line)
+        lines.append(current_line[np.argsort(x[current_line], kind='stable')])
+    
+    # Sort lines from top to bottom (by minimum y position)
+    lines.sort(key=lambda line: y[line].min())
+    
+    # Convert lines to line objects with combined bounding box
+    line_objects = []
+    for line_blocks in lines:
+        # Calculate bounding box for entire line
+        min_x = int(x[line_blocks].min())
+        min_y = int(y[line_blocks].min())
+        max_x = int(right[line_blocks].max())
+        max_y = int(bottom[line_blocks].max())
+        
+        # Join text with spaces
+        line_text = ' '.join(values[i] for i in line_blocks)
+        
+        line_objects.append({
+            'value': line_text,
+            'x': min_x,
+            'y': min_y,
+            'width': max_x - min_x,
+            'height': max_y - min_y,
+            'avg_confidence': sum(confidences[i] for i in line_blocks) / len(line_blocks)
+        })
+    
+    # STAGE 2: Group lines into multi-line blocks (vertical stacking)
+    # Lines are sorted top to bottom and a block only grows with the line right
+    # after its last one, so a single pass splits them into runs of stacked lines
+    line_groups = []
+    for line in line_objects:
+        if line_groups:
+            last_line = line_groups[-1][-1]
             
-            raw_blocks.append({
-                'value': text,
-                'x': int(ocr_data['left'][i]),
-                'y': int(ocr_data['top'][i]),
-                'width': int(ocr_data['width'][i]),
-                'height': int(ocr_data['height'][i]),
-                'confidence': round(confidence, 1)
-            })
-        
-        if not raw_blocks:
-            return []
-        
-        # STAGE 1: Group blocks into lines (horizontal alignment)
-        # Use a smarter clustering approach instead of simple sorting
-        lines = []
-        used_blocks = set()
-        
-        # Sort blocks by x position for initial scanning
-        blocks_by_x = sorted(enumerate(raw_blocks), key=lambda b: b[1]['x'])
-        
-        for idx, seed_block in blocks_by_x:
-            if idx in used_blocks:
-                continue
-            
-            # Start a new line with this seed block
-            current_line = [seed_block]
-            used_blocks.add(idx)
-            
-            # Find all other blocks that belong to this line
-            # Scan through remaining blocks and check if they're on the same line
-            for j, candidate in enumerate(raw_blocks):
-                if j in used_blocks:
-                    continue
-                
-                # Check if candidate can join any block already in the current line
-                can_join = False
-                for line_block in current_line:
-                    # Check vertical alignment (do they overlap vertically or are close?)
-                    vertical_distance = abs(candidate['y'] - line_block['y'])
-                    height_ratio = max(candidate['height'], line_block['height']) / min(candidate['height'], line_block['height'])
-                    
-                    # Calculate horizontal position relationship
-                    candidate_left = candidate['x']
-                    candidate_right = candidate['x'] + candidate['width']
-                    line_block_left = line_block['x']
-                    line_block_right = line_block['x'] + line_block['width']
-                    
-                    # Check if they're horizontally near each other
-                    horizontal_gap = min(
-                        abs(candidate_left - line_block_right),
-                        abs(line_block_left - candidate_right)
-                    )
-                    
-                    # Same line if: vertically aligned, similar height, horizontally close
-                    if vertical_distance <= 10 and height_ratio <= 1.5 and horizontal_gap < 100:
-                        can_join = True
-                        break
-                
-                if can_join:
-                    current_line.append(candidate)
-                    used_blocks.add(j)
-            
-            # Sort blocks in this line from left to right
-            current_line.sort(key=lambda b: b['x'])
-            lines.append(current_line)
-        
-        # Sort lines from top to bottom (by minimum y position)
-        lines.sort(key=lambda line: min(b['y'] for b in line))
-        
-        # Convert lines to line objects with combined bounding box
-        line_objects = []
-        for line_blocks in lines:
-            # Calculate bounding box for entire line
-            min_x = min(b['x'] for b in line_blocks)
-            min_y = min(b['y'] for b in line_blocks)
-            max_x = max(b['x'] + b['width'] for b in line_blocks)
-            max_y = max(b['y'] + b['height'] for b in line_blocks)
+            # Check if line should be grouped with current block
+            vertical_gap = line['y'] - (last_line['y'] + last_line['height'])
             
-            # Sort blocks in line from left to right
-            line_blocks.sort(key=lambda b: b['x'])
+            # Require at least some horizontal overlap (lines must be vertically aligned)
+            overlap_left = max(last_line['x'], line['x'])
+            overlap_right = min(last_line['x'] + last_line['width'], line['x'] + line['width'])
+            has_overlap = overlap_right > overlap_left
             
-            # Join text with spaces
-            line_text = ' '.join(b['value'] for b in line_blocks)
+            # Check height similarity (prevent grouping very different sizes):
+            # ratio of at most 1.5, compared in integers as 2 * max <= 3 * min,
+            # zero-height lines are never stacked with another one
+            min_height = min(line['height'], last_line['height'])
+            similar_height = min_height > 0 and 2 * max(line['height'], last_line['height']) <= 3 * min_height
             
-            line_objects.append({
-                'value': line_text,
-                'x': min_x,
-                'y': min_y,
-                'width': max_x - min_x,
-                'height': max_y - min_y,
-                'blocks': line_blocks,
-                'avg_confidence': sum(b['confidence'] for b in line_blocks) / len(line_blocks)
-            })
-        
-        # STAGE 2: Group lines into multi-line blocks (vertical stacking)
-        final_blocks = []
-        used_lines = set()
-        
-        for i, line in enumerate(line_objects):
-            if i in used_lines:
+            # Group if: close vertically, have horizontal overlap, and similar heights
+            if vertical_gap <= 15 and has_overlap and similar_height:
+                line_groups[-1].append(line)
                 continue
-            
-            # Start a new multi-line block
-            block_lines = [line]
-            used_lines.add(i)
-            
-            # Look for lines below that should be grouped
-            for j in range(i + 1, len(line_objects)):
-                if j in used_lines:
-                    continue
-                
-                next_line = line_objects[j]
-                last_line = block_lines[-1]
-                
-                # Check if next line should be grouped with current block
-                vertical_gap = next_line['y'] - (last_line['y'] + last_line['height'])
-                
-                # Check horizontal overlap (lines must be vertically aligned)
-                last_line_left = last_line['x']
-                last_line_right = last_line['x'] + last_line['width']
-                next_line_left = next_line['x']
-                next_line_right = next_line['x'] + next_line['width']
-                
-                # Calculate overlap
-                overlap_left = max(last_line_left, next_line_left)
-                overlap_right = min(last_line_right, next_line_right)
-                horizontal_overlap = max(0, overlap_right - overlap_left)
-                
-                # Require at least some horizontal overlap for multi-line grouping
-                min_width = min(last_line['width'], next_line['width'])
-                has_overlap = horizontal_overlap > 0
-                
-                # Check height similarity (prevent grouping very different sizes)
-                height_ratio = max(next_line['height'], last_line['height']) / min(next_line['height'], last_line['height'])
-                
-                # Group if: close vertically, have horizontal overlap, and similar heights
-                if vertical_gap <= 15 and has_overlap and height_ratio <= 1.5:
-                    block_lines.append(next_line)
-                    used_lines.add(j)
-                else:
-                    # Too far apart or not aligned, stop looking
-                    break
-            
-            # Create final block
-            min_x = min(line['x'] for line in block_lines)
-            min_y = min(line['y'] for line in block_lines)
-            max_x = max(line['x'] + line['width'] for line in block_lines)
-            max_y = max(line['y'] + line['height'] for line in block_lines)
-            
-            # Calculate average line height (representative of actual text size)
-            avg_line_height = sum(line['height'] for line in block_lines) / len(block_lines)
-            
-            # Join lines with specified separator
-            separator = '\n' if join_char == 'newline' else ' '
-            block_text = separator.join(line['value'] for line in block_lines)
-            
-            final_blocks.append({
-                'value': block_text,
-                'x': min_x,
-                'y': min_y,
-                'width': max_x - min_x,
-                'height': max_y - min_y,
-                'line_height': round(avg_line_height, 1),
-                'line_count': len(block_lines),
-                'confidence': sum(line['avg_confidence'] for line in block_lines) / len(block_lines)
-            })
-        
-        return final_blocks
+        
+        # Too far apart or not aligned, start a new multi-line block
+        line_groups.append([line])
+    
+    final_blocks = []
+    for block_lines in line_groups:
+        # Create final block
+        min_x = min(line['x'] for line in block_lines)
+        min_y = min(line['y'] for line in block_lines)
+        max_x = max(line['x'] + line['width'] for line in block_lines)
+        max_y = max(line['y'] + line['height'] for line in block_lines)
+        
+        # Calculate average line height (representative of actual text size)
+        avg_line_height = sum(line['height'] for line in block_lines) / len(block_lines)
+        
+        # Join lines with specified separator
+        separator = '\n' if join_char == 'newline' else ' '
+        block_text = separator.join(line['value'] for line in block_lines)
+        
+        final_blocks.append({
+            'value': block_text,
+            'x': min_x,
+            'y': min_y,
+            'width': max_x - min_x,
+            'height': max_y - min_y,
+            'line_height': round(avg_line_height, 1),
+            'line_count': len(block_lines),
+            'confidence': sum(line['avg_confidence'] for line in block_lines) / len(block_lines)
+        })
+    
+    return final_blocks
+
+
+def _get_tesserocr_api():
+    """
+    Get this process's tesserocr API, creating it on first use.
+    
+    The Tesseract model is loaded once per process and reused for every image,
+    so each worker process of a pool owns its own instance.
+    """
+    global _tesserocr_api
+    if _tesserocr_api is None:
+        _tesserocr_api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.AUTO)
+        atexit.register(_tesserocr_api.End)
+    return _tesserocr_api
+
+
+def preprocess_for_ocr(image, scale=OCR_UPSCALE):
+    """
+    Prepare an image for OCR: grayscale, upscale, denoise and binarize it.
+    
+    The image is upscaled with cubic interpolation, smoothed with a small Gaussian
+    blur to remove compression noise and binarized with Otsu's threshold, which
+    helps Tesseract with small or low-contrast text.
+    
+    Args:
+        image (str or numpy.ndarray): Path to image file, or OpenCV image (BGR or grayscale)
+        scale (int): Upscaling factor (default: OCR_UPSCALE)
+        
+    Returns:
+        numpy.ndarray: Binary (0/255) grayscale image, `scale` times larger
+    """
+    if not isinstance(image, np.ndarray):
+        image = cv2.imread(image, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            raise ValueError("could not read image")
+    gray = _to_gray(image)
+    if scale != 1:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+    gray = cv2.GaussianBlur(gray, (3, 3), 0)
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+
+def _scale_word_columns(raw_blocks, scale):
+    """Map word positions and sizes of an image upscaled by `scale` back to the original image."""
+    for key in ('x', 'y', 'width', 'height'):
+        raw_blocks[key] = np.rint(np.asarray(raw_blocks[key], dtype=np.float64) / scale).astype(np.int64)
+    return raw_blocks
+
+
+def extract_text_from_image(image, join_char='space', preprocess=False, psm=DEFAULT_PSM):
+    """
+    Extract text from an image using OCR with intelligent grouping.
+    
+    Groups text blocks into lines (horizontal) and then multi-line blocks (vertical).
+    Uses a clustering approach to handle variable baselines and text positions.
+    
+    With tesserocr installed, OCR runs in-process on a persistent Tesseract
+    instance instead of starting a Tesseract process for every image.
+    
+    Args:
+        image (str or numpy.ndarray): Path to image file, or image already in memory as an
+            OpenCV image (BGR or grayscale), e.g. a frame from iter_frames() without images_dir
+        join_char (str): 'space' or 'newline' to join multi-line text
+        preprocess (bool): Upscale and binarize the image before OCR, see preprocess_for_ocr().
+            Positions and sizes are still reported in original image pixels (default: False)
+        psm (int): Tesseract page segmentation mode, e.g. 6 to read the image as a single
+            uniform block of text, which skips layout analysis (default: 3, automatic)
+        
+    Returns:
+        list: List of dictionaries containing text blocks with position and confidence
+    """
+    in_memory = isinstance(image, np.ndarray)
+    source = 'in-memory image' if in_memory else image
+    try:
+        if preprocess:
+            image = preprocess_for_ocr(image)
+            in_memory = True
+        
+        if in_memory and image.ndim == 3:
+            # Tesseract expects RGB pixels
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        
+        if tesserocr is not None:
+            api = _get_tesserocr_api()
+            api.SetPageSegMode(psm)
+            if in_memory:
+                height, width = image.shape[:2]
+                bytes_per_pixel = 1 if image.ndim == 2 else 3
+                api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, bytes_per_pixel * width)
+            else:
+                api.SetImageFile(image)
+            raw_blocks = _raw_blocks_from_tesserocr(api)
+        else:
+            # Perform OCR, handing file paths straight to Tesseract: a PIL image
+            # would be decoded here only to be re-encoded to a temporary file
+            ocr_data = pytesseract.image_to_data(image, output_type=Output.DICT, config=f'--psm {psm}')
+            raw_blocks = _raw_blocks_from_ocr_data(ocr_data)
+        
+        if preprocess:
+            raw_blocks = _scale_word_columns(raw_blocks, OCR_UPSCALE)
+        
+        return group_text_blocks(raw_blocks, join_char)
         
     except Exception as e:
-        print(f"Warning: OCR failed for {image_path}: {e}", file=sys.stderr)
+        print(f"Warning: OCR failed for {source}: {e}", file=sys.stderr)
         return []
+
+
+def _extract_text_from_image_list(image_paths, join_char='space', psm=DEFAULT_PSM):
+    """
+    Extract text from several images with a single Tesseract process.
+    
+    Tesseract accepts a text file listing images, recognizing each as a page of
+    one document, which saves starting Tesseract and loading its model per image.
+    
+    Args:
+        image_paths (list): Paths to image files
+        join_char (str): 'space' or 'newline' to join multi-line text
+        psm (int): Tesseract page segmentation mode (default: 3, automatic)
+        
+    Returns:
+        list: Text blocks for each image, in the same order as `image_paths`
+    """
+    list_fd, list_path = tempfile.mkstemp(suffix='.txt')
+    try:
+        with os.fdopen(list_fd, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(image_paths) + '\n')
+        ocr_data = pytesseract.image_to_data(list_path, output_type=Output.DICT, config=f'--psm {psm}')
+        pages = np.asarray(ocr_data['page_num'])
+    except Exception:
+        pages = None
+    finally:
+        os.remove(list_path)
+    
+    # Every image gets at least its page row; if some are missing (e.g. an image
+    # couldn't be read), OCR images one by one so each result is matched to its image
+    if pages is None or np.unique(pages).size != len(image_paths):
+        return [extract_text_from_image(image_path, join_char, psm=psm) for image_path in image_paths]
+    
+    # Rows are ordered by page (1-based), slice each page's rows
+    bounds = np.searchsorted(pages, np.arange(1, len(image_paths) + 2))
+    results = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        page_data = {key: ocr_data[key][start:end] for key in ('text', 'conf', 'left', 'top', 'width', 'height')}
+        results.append(group_text_blocks(_raw_blocks_from_ocr_data(page_data), join_char))
+    return results
+
+
+def extract_text_from_images_batch(image_paths, join_char='space', batch_size=16, preprocess=False,
+                                   psm=DEFAULT_PSM):
+    """
+    Extract text from several images, reusing one Tesseract instance for the whole batch.
+    
+    With tesserocr installed, the Tesseract model is loaded once per process and
+    every image is recognized in-process, instead of starting a Tesseract process
+    per image. Otherwise, each group of `batch_size` images is recognized by a
+    single Tesseract process.
+    
+    Args:
+        image_paths (iterable): Paths to image files
+        join_char (str): 'space' or 'newline' to join multi-line text
+        batch_size (int): Images per Tesseract process without tesserocr (default: 16)
+        preprocess (bool): Upscale and binarize images before OCR, see preprocess_for_ocr().
+            Without tesserocr, preprocessed images are recognized one by one (default: False)
+        psm (int): Tesseract page segmentation mode (default: 3, automatic)
+        
+    Yields:
+        list: Text blocks for each image, in the same order as `image_paths`
+    """
+    if tesserocr is not None or preprocess:
+        for image_path in image_paths:
+            yield extract_text_from_image(image_path, join_char, preprocess, psm)
+        return
+    
+    image_paths = iter(image_paths)
+    while True:
+        batch = list(islice(image_paths, batch_size))
+        if not batch:
+            return
+        yield from _extract_text_from_image_list(batch, join_char, psm)
+
+
+def _ocr_batch(image_paths, join_char, preprocess=False, psm=DEFAULT_PSM):
+    """OCR a batch of images (runs in a worker process)."""
+    return list(extract_text_from_images_batch(image_paths, join_char, preprocess=preprocess, psm=psm))
+
+
+def extract_text_from_images(image_paths, join_char='space', jobs=None, batch_size=16, preprocess=False,
+                             psm=DEFAULT_PSM):
+    """
+    Extract text from many images with Tesseract, spread across worker processes.
+    
+    OCR is CPU-bound and independent per image, so batches of images are
+    recognized in parallel, each by extract_text_from_images_batch() in a
+    worker process running a single-threaded Tesseract.
+    
+    Args:
+        image_paths (iterable): Paths to image files
+        join_char (str): 'space' or 'newline' to join multi-line text
+        jobs (int, optional): Number of worker processes (default: half the CPUs,
+            1 recognizes images in the calling process)
+        batch_size (int): Images per worker task (default: 16)
+        preprocess (bool): Upscale and binarize images before OCR, see preprocess_for_ocr()
+        psm (int): Tesseract page segmentation mode (default: 3, automatic)
+        
+    Yields:
+        list: Text blocks for each image, in the same order as `image_paths`
+    """
+    if jobs is None:
+        jobs = max(1, (os.cpu_count() or 1) // 2)
+    if jobs <= 1:
+        yield from extract_text_from_images_batch(image_paths, join_char, batch_size, preprocess, psm)
+        return
+    
+    image_paths = list(image_paths)
+    
+    # Keep Tesseract single-threaded, parallelism comes from the pool. OpenMP reads the limit
+    # when it is loaded, so it must be in the environment workers start with: workers are
+    # spawned (a forked worker inherits an already loaded Tesseract) while it is set, which
+    # the submissions below do
+    previous_thread_limit = os.environ.get('OMP_THREAD_LIMIT')
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    try:
+        executor = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('spawn'))
+        futures = [
+            executor.submit(_ocr_batch, image_paths[i:i + batch_size], join_char, preprocess, psm)
+            for i in range(0, len(image_paths), batch_size)
+        ]
+    finally:
+        if previous_thread_limit is None:
+            del os.environ['OMP_THREAD_LIMIT']
+        else:
+            os.environ['OMP_THREAD_LIMIT'] = previous_thread_limit
+    
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        # Don't start batches nobody will read if iteration stopped early
+        for future in futures:
+            future.cancel()
+        executor.shutdown()
+
+
+def _get_easyocr_reader(gpu=True):
+    """
+    Get this process's EasyOCR reader, creating it on first use.
+    
+    EasyOCR (and PyTorch) is only imported here, as loading it is slow and it is
+    only needed for the EasyOCR backend.
+    """
+    global _easyocr_reader
+    if _easyocr_reader is None:
+        import easyocr
+        
+        # All frames of a video have the same size, let cuDNN pick the fastest kernels for it
+        _easyocr_reader = easyocr.Reader(['en'], gpu=gpu, cudnn_benchmark=True, verbose=False)
+    return _easyocr_reader
+
+
+def extract_text_from_images_easyocr(image_paths, join_char='space', batch_size=16, gpu=True):
+    """
+    Extract text from several images with EasyOCR, recognizing them in batches.
+    
+    Consecutive images of the same size are sent to the model together, which
+    amortizes the per-call overhead, especially on GPU. Images of a video all
+    share the same size, so batches are normally full.
+    
+    Args:
+        image_paths (iterable): Paths to image files
+        join_char (str): 'space' or 'newline' to join multi-line text
+        batch_size (int): Maximum number of images recognized at once (default: 16)
+        gpu (bool): Run the model on GPU when available (default: True)
+        
+    Yields:
+        list: Text blocks for each image, in the same order as `image_paths`
+    """
+    reader = _get_easyocr_reader(gpu)
+    batch_paths = []
+    batch_images = []
+    
+    def recognize_batch():
+        height, width = batch_images[0].shape[:2]
+        try:
+            batch_detections = reader.readtext_batched(batch_images, n_width=width, n_height=height,
+                                                       batch_size=len(batch_images))
+        except Exception as e:
+            print(f"Warning: OCR failed for {batch_paths[0]} and {len(batch_paths) - 1} following image(s): {e}",
+                  file=sys.stderr)
+            batch_detections = [[] for _ in batch_paths]
+        results = [group_text_blocks(_raw_blocks_from_easyocr(detections), join_char)
+                   for detections in batch_detections]
+        batch_paths.clear()
+        batch_images.clear()
+        return results
+    
+    for image_path in image_paths:
+        image = cv2.imread(image_path)
+        
+        # Flush the pending batch when it is full or the next image has another size
+        if batch_images and (image is None or len(batch_images) >= batch_size
+                             or image.shape != batch_images[0].shape):
+            yield from recognize_batch()
+        
+        if image is None:
+            print(f"Warning: OCR failed for {image_path}: cannot read image", file=sys.stderr)
+            yield []
+            continue
+        
+        batch_paths.append(image_path)
+        batch_images.append(image)
+    
+    if batch_images:
+        yield from recognize_batch()